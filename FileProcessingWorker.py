@@ -1,22 +1,47 @@
-from PyQt5.QtCore import QThread, pyqtSignal
-import re
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 import traceback
-import os
-import codecs
 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 
-class FileProcessingWorker(QThread):
+from utils.xml_parser import XMLParser
+
+# Rows written between progress updates of an Excel export
+EXCEL_PROGRESS_ROWS = 500
+
+
+class _ParseCancelled(Exception):
+    """Raised from the parse progress callback to stop a parse that was cancelled."""
+
+
+class WorkerSignals(QObject):
+    """Signals of a FileProcessingWorker; a QRunnable is not a QObject and cannot define them."""
     progress_signal = pyqtSignal(int, str)
     finished_signal = pyqtSignal(dict)
     error_signal = pyqtSignal(str)
 
+
+class FileProcessingWorker(QRunnable):
+    """File operation run on the shared QThreadPool, so several operations can run side by side."""
+
     def __init__(self, file_path, operation_type, parent=None):
         super().__init__()
+        # The window keeps a reference to query or cancel the worker after it finishes
+        self.setAutoDelete(False)
         self.file_path = file_path
         self.operation_type = operation_type
         self.parent = parent
         self.data = {}
         self._cancelled = False
+        self._running = False
+        self._last_progress = -1
+
+        # Expose the signals under the same names the QThread version had
+        self.signals = WorkerSignals()
+        self.progress_signal = self.signals.progress_signal
+        self.finished_signal = self.signals.finished_signal
+        self.error_signal = self.signals.error_signal
 
     def set_data(self, key, value):
         self.data[key] = value
@@ -24,6 +49,14 @@ class FileProcessingWorker(QThread):
     def cancel(self):
         self._cancelled = True
 
+    def start(self):
+        """Queue the worker on the global thread pool."""
+        self._running = True
+        QThreadPool.globalInstance().start(self)
+
+    def isRunning(self):
+        return self._running
+
     def run(self):
         try:
             if self._cancelled:
@@ -33,71 +66,57 @@ class FileProcessingWorker(QThread):
                 self._parse_xml()
             elif self.operation_type == 'export_file':
                 self._export_file()
+            elif self.operation_type == 'export_excel':
+                self._export_excel()
             elif self.operation_type == 'process_document':
                 self._process_document()
             else:
                 self.error_signal.emit(f"Unknown operation type: {self.operation_type}")
         except Exception as e:
-            import traceback
             trace = traceback.format_exc()
             self.error_signal.emit(f"Error in worker thread: {str(e)}\n{trace}")
+        finally:
+            self._running = False
 
     def _parse_xml(self):
         """Worker thread method to parse XML."""
         try:
             # Report progress
-            self.progress_signal.emit(10, "Reading file...")
-
-            # Read file in chunks to avoid memory issues
-            with open(self.file_path, 'rb') as f:
-                # Get file size
-                f.seek(0, 2)
-                file_size = f.tell()
-                f.seek(0)
+            self.progress_signal.emit(10, "Parsing XML...")
 
-                # Read in chunks of 1MB
-                chunk_size = 1024 * 1024
-                content = b''
-
-                bytes_read = 0
-                while True:
-                    if self._cancelled:
-                        return
-
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-
-                    content += chunk
-                    bytes_read += len(chunk)
-
-                    # Report progress
-                    progress = int((bytes_read / file_size) * 50)  # 50% for reading
-                    self.progress_signal.emit(progress,
-                                              f"Reading file... ({bytes_read / 1024 / 1024:.1f}MB / {file_size / 1024 / 1024:.1f}MB)")
-
-            # Decode content
-            self.progress_signal.emit(50, "Decoding content...")
-            xml_content = content.decode('utf-8', errors='ignore')
-
-            # Parse XML
-            self.progress_signal.emit(60, "Parsing XML...")
-            from utils.xml_parser import XMLParser
-            processed_data = XMLParser.parse_xml(xml_content, print)
+            try:
+                processed_data = XMLParser.parse_xml_file(self.file_path, print, self._report_parse_progress)
+            except _ParseCancelled:
+                return
+            if self._cancelled:
+                return
 
             # Emit results
             self.progress_signal.emit(100, "Processing complete")
             self.finished_signal.emit({
                 'processed_data': processed_data,
-                'original_xml_content': xml_content,
                 'file_path': self.file_path
             })
 
         except Exception as e:
-            import traceback
             trace = traceback.format_exc()
             self.error_signal.emit(f"Error parsing XML: {str(e)}\n{trace}")
 
+    def _report_parse_progress(self, bytes_read, total_bytes):
+        """Map parser byte progress onto the 10-95% range of the progress bar."""
+        # The parser calls back after every group, so a cancel stops it mid-file
+        if self._cancelled:
+            raise _ParseCancelled()
+
+        if total_bytes:
+            progress = 10 + int((bytes_read / total_bytes) * 85)
+            # Emit only when the bar would move, not for every chunk read
+            if progress == self._last_progress:
+                return
+            self._last_progress = progress
+            self.progress_signal.emit(progress,
+                                      f"Parsing XML... ({bytes_read / 1024 / 1024:.1f}MB / {total_bytes / 1024 / 1024:.1f}MB)")
+
     def _export_file(self):
         """Worker thread method to export file."""
         try:
@@ -105,35 +124,96 @@ class FileProcessingWorker(QThread):
 
             # Get data from parent
             processed_data = self.data.get('processed_data', [])
-            original_xml_content = self.data.get('original_xml_content', '')
+            source_file_path = self.data.get('source_file_path', '')
 
-            # Update XML content
+            # Update XML content (the original is re-read from disk) and write to file
             self.progress_signal.emit(30, "Updating XML content...")
-            from utils.xml_parser import XMLParser
-            updated_xml = XMLParser.update_xml_content(
-                original_xml_content,
+            XMLParser.update_xml_file(
+                source_file_path,
+                self.file_path,
                 processed_data,
                 print
             )
 
-            # Write to file
-            self.progress_signal.emit(70, "Writing to file...")
-            import codecs
-            with codecs.open(self.file_path, 'w', 'utf-8') as f:
-                f.write(updated_xml)
-
             # Emit results
             self.progress_signal.emit(100, "Export complete")
             self.finished_signal.emit({
                 'success': True,
-                'file_path': self.file_path
+                'file_path': self.file_path,
+                'edited_count': self.data.get('edited_count', 0)
             })
 
         except Exception as e:
-            import traceback
             trace = traceback.format_exc()
             self.error_signal.emit(f"Error exporting file: {str(e)}\n{trace}")
 
+    def _export_excel(self):
+        """Worker thread method to write the Excel export."""
+        try:
+            self.progress_signal.emit(5, "Preparing Excel export...")
+
+            # Rows are laid out by the window as (value, font, fill, alignment) cells
+            headers = self.data.get('headers', [])
+            column_widths = self.data.get('column_widths', [])
+            rows = self.data.get('rows', [])
+
+            # Write-only workbook: rows are streamed to disk as they are appended
+            # instead of every cell object being kept in memory
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("MXLIFF Data")
+            last_col_letter = get_column_letter(len(headers))
+
+            # Column widths must be set before the first row is written
+            for col_idx, width in enumerate(column_widths, 1):
+                ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+            def styled_cell(spec):
+                # Plain values are written unstyled
+                if not isinstance(spec, tuple):
+                    return spec
+                value, font, fill, alignment = spec
+                cell = WriteOnlyCell(ws, value=value)
+                if font is not None:
+                    cell.font = font
+                if fill is not None:
+                    cell.fill = fill
+                if alignment is not None:
+                    cell.alignment = alignment
+                return cell
+
+            ws.append([styled_cell(header) for header in headers])
+
+            total = len(rows) or 1
+            for row_index, (cells, merged) in enumerate(rows):
+                if self._cancelled:
+                    return
+
+                ws.append([styled_cell(cell) for cell in cells])
+                if merged:
+                    # A single cell spanning all columns; data starts after the header row
+                    excel_row = row_index + 2
+                    ws.merged_cells.add(f"A{excel_row}:{last_col_letter}{excel_row}")
+
+                if row_index % EXCEL_PROGRESS_ROWS == 0:
+                    progress = 5 + int(row_index / total * 85)
+                    self.progress_signal.emit(progress, f"Writing Excel rows... ({row_index}/{len(rows)})")
+
+            # Save the workbook
+            self.progress_signal.emit(90, "Saving Excel file...")
+            wb.save(self.file_path)
+
+            # Emit results
+            self.progress_signal.emit(100, "Excel export complete")
+            self.finished_signal.emit({
+                'success': True,
+                'file_path': self.file_path,
+                'row_count': len(rows)
+            })
+
+        except Exception as e:
+            trace = traceback.format_exc()
+            self.error_signal.emit(f"Error exporting to Excel: {str(e)}\n{trace}")
+
     def _process_document(self):
         """Worker thread method to process document."""
         try:
@@ -173,6 +253,5 @@ class FileProcessingWorker(QThread):
             })
 
         except Exception as e:
-            import traceback
             trace = traceback.format_exc()
             self.error_signal.emit(f"Error processing document: {str(e)}\n{trace}")
\ No newline at end of file
@@ -1,9 +1,25 @@
 # This file allows the ui directory to be imported as a package
 
-from ui.main_window import MXLIFFParser
-from ui.custom_widgets import DraggableHeaderView, DiffHighlighter, TranslationDiffDialog
-from ui.ui_components import UIComponents
-from ui.theme import ThemeManager
+# Submodules import PyQt5 and the parser stack, so classes are only imported on
+# first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    'MXLIFFParser': 'ui.main_window',
+    'DraggableHeaderView': 'ui.custom_widgets',
+    'DiffHighlighter': 'ui.custom_widgets',
+    'TranslationDiffDialog': 'ui.custom_widgets',
+    'UIComponents': 'ui.ui_components',
+    'ThemeManager': 'ui.theme'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Export the main classes
 __all__ = [
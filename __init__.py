@@ -10,8 +10,22 @@ from utils.utils import (
     find_text_differences
 )
 
-from utils.xml_parser import XMLParser
-from utils.document_parser import DocumentParser
+# Parser classes pull in pandas, numpy and PyMuPDF, so they are only imported on
+# first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    'XMLParser': 'utils.xml_parser',
+    'DocumentParser': 'utils.document_parser'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Export utility functions and classes
 __all__ = [
@@ -1,7 +1,134 @@
-from PyQt5.QtWidgets import QHeaderView, QDialog, QTextEdit, QLabel, QVBoxLayout, QHBoxLayout
+import re
+import string
+from functools import lru_cache
+
+from PyQt5.QtWidgets import (QHeaderView, QDialog, QTextEdit, QLabel, QVBoxLayout, QHBoxLayout,
+                             QStyledItemDelegate)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QSyntaxHighlighter
 
+try:
+    import ahocorasick  # Optional: pyahocorasick, used for large diff word sets
+except ImportError:
+    ahocorasick = None
+
+# Above this many diff words a single Aho-Corasick pass beats the regex alternation
+AHOCORASICK_MIN_WORDS = 32
+
+# ASCII alphanumerics, checked by set membership before falling back to str.isalnum()
+_ASCII_ALNUM = frozenset(string.ascii_letters + string.digits)
+
+
+@lru_cache(maxsize=64)
+def _compile_diff_pattern(words):
+    """Build the matcher for a tuple of diff words, returning (pattern, automaton).
+
+    Cached so that reopening comparison dialogs on the same rows does not
+    recompile the same regex or automaton.
+    """
+    words = sorted(words, key=len, reverse=True)
+
+    if ahocorasick is not None and len(words) >= AHOCORASICK_MIN_WORDS:
+        # One linear pass over the text finds every word, however many there are
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, len(word))
+        automaton.make_automaton()
+        return None, automaton
+
+    if words:
+        # One alternation for all words (longest first), matched only where the
+        # neighbouring characters are not alphanumeric, i.e. whole words
+        pattern = re.compile(
+            r'(?<![^\W_])(?:' + '|'.join(re.escape(word) for word in words) + r')(?![^\W_])'
+        )
+        return pattern, None
+
+    return None, None
+
+
+def _find_whole_word_spans(text, pattern, automaton):
+    """Return (start, end) spans of whole-word diff matches in text.
+
+    Both matchers run their inner loop in C (re or pyahocorasick); only the
+    boundary check for automaton hits is done here.
+    """
+    spans = []
+
+    if automaton is not None:
+        text_len = len(text)
+        for end_index, word_len in automaton.iter(text):
+            start = end_index - word_len + 1
+
+            # Make sure it's a whole word
+            if start > 0:
+                char = text[start - 1]
+                if char in _ASCII_ALNUM or (char > '\x7f' and char.isalnum()):
+                    continue
+            if end_index + 1 < text_len:
+                char = text[end_index + 1]
+                if char in _ASCII_ALNUM or (char > '\x7f' and char.isalnum()):
+                    continue
+
+            spans.append((start, end_index + 1))
+    elif pattern is not None:
+        spans = [match.span() for match in pattern.finditer(text)]
+
+    return spans
+
+
+def _merge_spans(spans):
+    """Merge overlapping or adjacent (start, end) spans so each run is formatted once."""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+# Item data role marking a table cell that shows the info icon
+INFO_ICON_ROLE = Qt.UserRole + 5
+
+# Item data role marking a source cell whose entry has comments
+HAS_COMMENT_ROLE = Qt.UserRole + 6
+
+# Marker drawn in front of the source text of commented entries
+COMMENT_MARKER = '💬 '
+
+
+class TableCellDelegate(QStyledItemDelegate):
+    """Item delegate that paints the info icon and the comment marker from item data roles.
+
+    Flagged cells keep their plain text, and no widget is created per row.
+    """
+
+    def __init__(self, pixmap, parent=None):
+        super().__init__(parent)
+        self.pixmap = pixmap
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        # Prefixing the displayed text also makes the size hint account for the marker
+        if index.data(HAS_COMMENT_ROLE):
+            option.text = COMMENT_MARKER + option.text
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        if index.data(INFO_ICON_ROLE):
+            icon_rect = self.pixmap.rect()
+            icon_rect.moveCenter(option.rect.center())
+            painter.drawPixmap(icon_rect.topLeft(), self.pixmap)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        if index.data(INFO_ICON_ROLE):
+            size = size.expandedTo(self.pixmap.size())
+        return size
+
+
 class DraggableHeaderView(QHeaderView):
     """Custom header view that prevents column reordering."""
 
@@ -22,31 +149,14 @@ class DiffHighlighter(QSyntaxHighlighter):
         self.diff_format.setForeground(QColor("red"))
         self.diff_format.setFontWeight(QFont.Bold)
 
+        self._pattern, self._automaton = _compile_diff_pattern(
+            tuple(sorted({word for word in diff_words if word}))
+        )
+
     def highlightBlock(self, text):
         """Highlight words that are in the diff_words list."""
-        for word in self.diff_words:
-            if not word:
-                continue
-
-            # Find all occurrences of the word
-            start_index = 0
-            while start_index < len(text):
-                index = text.find(word, start_index)
-                if index == -1:
-                    break
-
-                # Make sure it's a whole word
-                is_whole_word = True
-                if index > 0 and text[index - 1].isalnum():
-                    is_whole_word = False
-                end_index = index + len(word)
-                if end_index < len(text) and text[end_index].isalnum():
-                    is_whole_word = False
-
-                if is_whole_word:
-                    self.setFormat(index, len(word), self.diff_format)
-
-                start_index = index + len(word)
+        for start, end in _merge_spans(_find_whole_word_spans(text, self._pattern, self._automaton)):
+            self.setFormat(start, end - start, self.diff_format)
 
 
 class TranslationDiffDialog(QDialog):
@@ -1,10 +1,95 @@
 import os
 import re
+import time
 import traceback
+import numpy as np
 import pandas as pd
 import tempfile
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 import functools
+import heapq
+from difflib import SequenceMatcher
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Optional: C++ fuzzy matching, falls back to difflib.SequenceMatcher when missing
+    from rapidfuzz import fuzz, process as fuzzy_process
+except ImportError:
+    fuzz = fuzzy_process = None
+
+# Text cleaning patterns, compiled once. A regex character class scans in C and
+# only allocates for actual hits; str.translate with a dict table looks up every
+# character and measured several times slower on per-cell strings.
+# Low-9 and reversed quotes and all control characters become spaces
+_QUOTE_CTRL_RE = re.compile('[\u201a\u201b\u201e\u201f\x00-\x1f\x7f]')
+
+# Non-breaking spaces and control characters (except tab, newline, carriage return) become spaces
+_CTRL_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\xa0]')
+
+# Column header patterns (case insensitive): the conversation marker column
+# ("...conversation...", "conv" or "table") and the source / comment columns
+_CONVERSATION_COL_RE = re.compile(r'conversation|\Aconv\Z|\Atable\Z', re.IGNORECASE)
+_SOURCE_COL_RE = re.compile('source', re.IGNORECASE)
+_COMMENT_COL_RE = re.compile('comment', re.IGNORECASE)
+
+# Write per-row match details to match_debug.log (collected in memory, written once)
+DEBUG_MATCH = False
+
+# Minimum similarity ratio for a fuzzy match
+FUZZY_THRESHOLD = 0.8
+
+# Each PDF worker process re-imports PyQt5, pandas and PyMuPDF, which takes about a
+# second, so only longer PDFs are split over processes, and only over a few of them
+PDF_PARALLEL_MIN_PAGES = 8
+PDF_MAX_WORKERS = 4
+
+
+@functools.lru_cache(maxsize=8192)
+def _clean_for_comparison(text):
+    """Normalize text for matching; cached on the text alone, so repeated sources are cleaned once."""
+    # Low-9 and reversed quotes and control characters become spaces, then
+    # split/join collapses whitespace runs and trims the ends in one C pass
+    return ' '.join(_QUOTE_CTRL_RE.sub(' ', text).split())
+
+
+def _char_bitmap(text):
+    """Fold the characters of text into a 64-bit presence bitmap (code point mod 64)."""
+    bitmap = 0
+    for ch in set(text):
+        bitmap |= 1 << (ord(ch) & 63)
+    return bitmap
+
+
+def _find_column(columns, pattern):
+    """Return the first column whose header matches pattern, or None."""
+    return next((col for col in columns if pattern.search(str(col))), None)
+
+
+def _frame_from_rows(headers, data):
+    """
+    Build a DataFrame column by column from row lists.
+
+    Rows shorter than the headers are padded with '' and longer ones truncated.
+    Passing whole columns skips pandas' row-to-column transpose.
+    """
+    df = pd.DataFrame({
+        col_idx: [row[col_idx] if col_idx < len(row) else '' for row in data]
+        for col_idx in range(len(headers))
+    })
+    # Headers are assigned afterwards because they may repeat, which dict keys cannot
+    df.columns = headers
+    return df
+
+
+def _extract_pdf_page_tables(file_path, page_num):
+    """Find the tables on one page of a PDF file; runs in a worker process."""
+    import fitz  # PyMuPDF
+    parser = DocumentParser()
+    with fitz.open(file_path, filetype='pdf') as doc:
+        page_tables = parser._extract_page_tables(doc.load_page(page_num), page_num)
+    return page_tables, parser.debug_info
 
 
 class DocumentParser:
@@ -21,62 +106,6 @@ class DocumentParser:
         self.file_type = None
         self.debug_info = []  # Store debug info for troubleshooting
 
-    def parse_document(self, file_path=None):
-        """Parse document with improved performance."""
-        if file_path:
-            self.file_path = file_path
-
-        if not self.file_path:
-            return False
-
-        try:
-            # Determine file type and use appropriate parser
-            if self.file_path.lower().endswith('.docx'):
-                return self._parse_docx_optimized()
-            elif self.file_path.lower().endswith('.pdf'):
-                return self._parse_pdf_optimized()
-            else:
-                return False
-        except Exception as e:
-            self.parent.log(f"Error parsing document: {str(e)}")
-            import traceback
-            self.parent.log(traceback.format_exc())
-            return False
-
-    def _parse_docx_optimized(self):
-        """Parse DOCX file with optimized performance."""
-        import docx
-
-        try:
-            self.doc = docx.Document(self.file_path)
-            self.tables = []
-
-            # Process tables in chunks
-            table_count = len(self.doc.tables)
-            for i, table in enumerate(self.doc.tables):
-                # Report progress to parent if available
-                if hasattr(self.parent, 'worker') and hasattr(self.parent.worker, 'progress_signal'):
-                    progress = int(20 + (i / table_count) * 30)  # 20-50% progress range
-                    self.parent.worker.progress_signal.emit(
-                        progress,
-                        f"Processing table {i + 1} of {table_count}..."
-                    )
-
-                # Allow event processing periodically
-                if i % 5 == 0:
-                    QApplication.processEvents()
-
-                # Process table data as before
-                # ...
-
-            return True
-
-        except Exception as e:
-            self.parent.log(f"Error parsing DOCX: {str(e)}")
-            import traceback
-            self.parent.log(traceback.format_exc())
-            return False
-
     def select_document(self):
         """
         Show a file dialog to select a Word or PDF document.
@@ -106,13 +135,27 @@ class DocumentParser:
         print(f"DocumentParser: {message}")
         self.debug_info.append(message)
 
-    def parse_document(self):
+    def _report_progress(self, value, message):
+        """Forward progress to the parent's worker, when parsing runs in one."""
+        worker = getattr(self.parent, 'worker', None)
+        if worker is not None:
+            worker.progress_signal.emit(value, message)
+
+    def parse_document(self, file_path=None):
         """
         Parse the selected document and extract tables.
 
+        Args:
+            file_path (str): Optional document to parse instead of the selected one
+
         Returns:
             bool: True if parsing succeeded, False otherwise
         """
+        if file_path:
+            self.file_path = file_path
+            _, extension = os.path.splitext(file_path)
+            self.file_type = extension.lower()
+
         if not self.file_path:
             return False
 
@@ -219,11 +262,20 @@ class DocumentParser:
         # Log document info
         self.log_debug(f"Word document contains {len(doc.tables)} tables")
 
-        # Extract tables from Word document
+        # Extract tables from Word document, reporting progress at most once per percent
+        table_count = len(doc.tables)
+        last_pct = -1
         for i, table in enumerate(doc.tables):
+            pct = 20 + (i * 30) // max(1, table_count)
+            if pct != last_pct:
+                self._report_progress(pct, f"Reading table {i + 1} of {table_count}...")
+                last_pct = pct
+
+            table_rows = self._read_docx_table(table)
+
             # Get number of rows and columns
-            rows = len(table.rows)
-            cols = len(table.rows[0].cells) if rows > 0 else 0
+            rows = len(table_rows)
+            cols = len(table_rows[0]) if rows > 0 else 0
 
             self.log_debug(f"Table {i + 1}: {rows} rows, {cols} columns")
 
@@ -236,43 +288,24 @@ class DocumentParser:
             headers = []
 
             # Get headers from first row
-            for cell in table.rows[0].cells:
-                header_text = self._clean_text(cell.text)
+            for cell_text in table_rows[0]:
+                header_text = self._clean_text(cell_text)
                 self.log_debug(f"Header found: '{header_text}'")
                 headers.append(header_text)
 
             # Get data from remaining rows
-            for row in table.rows[1:]:
-                row_data = []
-                for cell in row.cells:
-                    row_data.append(self._clean_text(cell.text))
-                data.append(row_data)
+            for row in table_rows[1:]:
+                data.append([self._clean_text(cell_text) for cell_text in row])
 
             # Convert to DataFrame
             if headers and data:
-                # Make sure data rows have same length as headers
-                uniform_data = []
-                for row in data:
-                    # Pad or truncate row to match headers length
-                    if len(row) < len(headers):
-                        row = row + [''] * (len(headers) - len(row))
-                    elif len(row) > len(headers):
-                        row = row[:len(headers)]
-                    uniform_data.append(row)
-
-                df = pd.DataFrame(uniform_data, columns=headers)
+                df = _frame_from_rows(headers, data)
 
                 # Check for "Conversation" or similar column (case insensitive)
-                has_conversation = False
-                conversation_col = None
-
-                for col in df.columns:
-                    # Check if column name contains "conversation" (case insensitive)
-                    if 'conversation' in col.lower() or col.lower() == 'conv' or col.lower() == 'table':
-                        has_conversation = True
-                        conversation_col = col
-                        self.log_debug(f"Found conversation column: '{col}'")
-                        break
+                conversation_col = _find_column(df.columns, _CONVERSATION_COL_RE)
+                has_conversation = conversation_col is not None
+                if has_conversation:
+                    self.log_debug(f"Found conversation column: '{conversation_col}'")
 
                 self.tables.append({
                     'id': i + 1,
@@ -285,22 +318,84 @@ class DocumentParser:
 
         return len(self.tables) > 0
 
+    def _read_docx_table(self, table):
+        """
+        Read the text of every cell of a python-docx table straight from its XML.
+
+        table.rows / row.cells rebuild python-docx's cell grid on every access, which
+        gets very slow on large tables; a single walk over the <w:tr>/<w:tc> elements
+        does not. As with row.cells, horizontally merged cells are repeated for each
+        grid column they span and vertically merged cells repeat the cell above.
+
+        Returns:
+            list: One list of cell texts per table row
+        """
+        from docx.oxml.ns import qn
+
+        w_tr, w_tc, w_p, w_r = qn('w:tr'), qn('w:tc'), qn('w:p'), qn('w:r')
+        w_tcPr, w_gridSpan, w_vMerge, w_val = qn('w:tcPr'), qn('w:gridSpan'), qn('w:vMerge'), qn('w:val')
+        w_t, w_tab = qn('w:t'), qn('w:tab')
+        line_breaks = (qn('w:br'), qn('w:cr'))
+
+        rows = []
+        previous_row = []
+        for tr in table._tbl.findall(w_tr):
+            row = []
+            for tc in tr.findall(w_tc):
+                span = 1
+                merge = None
+                tc_pr = tc.find(w_tcPr)
+                if tc_pr is not None:
+                    grid_span = tc_pr.find(w_gridSpan)
+                    if grid_span is not None:
+                        span = int(grid_span.get(w_val, 1))
+                    v_merge = tc_pr.find(w_vMerge)
+                    if v_merge is not None:
+                        merge = v_merge.get(w_val, 'continue')
+
+                if merge == 'continue' and len(previous_row) > len(row):
+                    text = previous_row[len(row)]
+                else:
+                    # Same text as cell.text: paragraphs joined by newlines, run tabs and breaks kept
+                    paragraphs = []
+                    for p in tc.findall(w_p):
+                        parts = []
+                        for run in p.iter(w_r):
+                            for child in run:
+                                if child.tag == w_t:
+                                    parts.append(child.text or '')
+                                elif child.tag == w_tab:
+                                    parts.append('\t')
+                                elif child.tag in line_breaks:
+                                    parts.append('\n')
+                        paragraphs.append(''.join(parts))
+                    text = '\n'.join(paragraphs)
+
+                row.extend([text] * span)
+
+            rows.append(row)
+            previous_row = row
+
+        return rows
+
     def _parse_pdf_document(self):
         """Parse tables from a PDF document."""
         try:
             import fitz  # PyMuPDF
-            doc = fitz.open(self.file_path)
             table_id = 1
 
-            self.log_debug(f"PDF document contains {len(doc)} pages")
+            # The extension already told us the type, so skip MuPDF's format detection;
+            # opening by path lets MuPDF read the file on demand rather than buffer it
+            with fitz.open(self.file_path, filetype='pdf') as doc:
+                self.log_debug(f"PDF document contains {len(doc)} pages")
 
-            # First try to extract tables using PyMuPDF's table finder
-            try:
-                self._extract_tables_with_pymupdf(doc, table_id)
-            except Exception as e:
-                self.log_debug(f"PyMuPDF table extraction failed: {str(e)}")
-                self.log_debug("Falling back to text extraction to find tables")
-                self._extract_tables_from_text(doc, table_id)
+                # First try to extract tables using PyMuPDF's table finder
+                try:
+                    self._extract_tables_with_pymupdf(doc, table_id)
+                except Exception as e:
+                    self.log_debug(f"PyMuPDF table extraction failed: {str(e)}")
+                    self.log_debug("Falling back to text extraction to find tables")
+                    self._extract_tables_from_text(doc, table_id)
 
             return len(self.tables) > 0
         except Exception as e:
@@ -310,58 +405,110 @@ class DocumentParser:
 
     def _extract_tables_with_pymupdf(self, doc, table_id):
         """Extract tables using PyMuPDF's table finder."""
-        import fitz
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
+        page_count = len(doc)
+
+        if page_count >= PDF_PARALLEL_MIN_PAGES:
+            # Pages are independent and table finding is CPU-bound, so spread the pages
+            # over worker processes; spawn avoids forking the threaded Qt process
+            workers = min(PDF_MAX_WORKERS, os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                page_results = []
+                for page_tables, debug_info in executor.map(
+                        functools.partial(_extract_pdf_page_tables, self.file_path),
+                        range(page_count)):
+                    # Keep the workers' debug messages for troubleshooting
+                    self.debug_info.extend(debug_info)
+                    page_results.append(page_tables)
+        else:
+            page_results = [self._extract_page_tables(doc.load_page(page_num), page_num)
+                            for page_num in range(page_count)]
+
+        # Collate in page order so table ids stay deterministic
+        for page_tables in page_results:
+            for headers, data in page_tables:
+                # Process the table data into a DataFrame
+                df = self._create_dataframe_from_table_data(headers, data, table_id)
+                if df is not None:
+                    table_id += 1
+
+    def _extract_page_tables(self, page, page_num):
+        """
+        Find the tables on a single PDF page.
 
-            # Extract tables using PyMuPDF's table extractor
-            tables = page.find_tables()
-            self.log_debug(f"Page {page_num + 1}: Found {len(tables.tables) if tables else 0} tables")
+        Returns:
+            list: (headers, data) tuples, one per table with at least one data row
+        """
+        page_tables = []
+
+        # Extract tables using PyMuPDF's table extractor
+        tables = page.find_tables()
+        self.log_debug(f"Page {page_num + 1}: Found {len(tables.tables) if tables else 0} tables")
+
+        if not tables or not tables.tables:
+            return page_tables
 
-            if not tables or not tables.tables:
+        # Extract the page's words once; cells are filled from this list below
+        # instead of re-running the text extractor with a clip per cell
+        words = page.get_text("words")
+
+        for table in tables.tables:
+            self.log_debug(f"Processing table with {table.row_count} rows, {table.cols} columns")
+
+            if table.row_count <= 1:  # Skip tables with only header or no data
+                self.log_debug("Skipping table (not enough rows)")
                 continue
 
-            for table in tables.tables:
-                self.log_debug(f"Processing table with {table.row_count} rows, {table.cols} columns")
+            headers = []
+            data = []
+
+            # Get headers from first row
+            if table.row_count > 0:
+                for col_idx in range(table.cols):
+                    cell_idx = col_idx
+                    if cell_idx < len(table.cells) and table.cells[cell_idx]:
+                        rect = table.cells[cell_idx].rect
+                        text = self._words_in_rect(words, rect)
+                        headers.append(self._clean_text(text))
+                        self.log_debug(f"Header found: '{text}'")
+                    else:
+                        headers.append(f"Column_{col_idx + 1}")
 
-                if table.row_count <= 1:  # Skip tables with only header or no data
-                    self.log_debug("Skipping table (not enough rows)")
-                    continue
+            # Get data from remaining rows
+            for row_idx in range(1, table.row_count):
+                row_data = []
+                for col_idx in range(table.cols):
+                    cell_idx = row_idx * table.cols + col_idx
+                    if cell_idx < len(table.cells) and table.cells[cell_idx]:
+                        rect = table.cells[cell_idx].rect
+                        text = self._words_in_rect(words, rect)
+                        row_data.append(self._clean_text(text))
+                    else:
+                        row_data.append("")
+                data.append(row_data)
 
-                headers = []
-                data = []
-
-                # Get headers from first row
-                if table.row_count > 0:
-                    for col_idx in range(table.cols):
-                        cell_idx = col_idx
-                        if cell_idx < len(table.cells) and table.cells[cell_idx]:
-                            rect = table.cells[cell_idx].rect
-                            text = page.get_text("text", clip=rect).strip()
-                            headers.append(self._clean_text(text))
-                            self.log_debug(f"Header found: '{text}'")
-                        else:
-                            headers.append(f"Column_{col_idx + 1}")
-
-                # Get data from remaining rows
-                for row_idx in range(1, table.row_count):
-                    row_data = []
-                    for col_idx in range(table.cols):
-                        cell_idx = row_idx * table.cols + col_idx
-                        if cell_idx < len(table.cells) and table.cells[cell_idx]:
-                            rect = table.cells[cell_idx].rect
-                            text = page.get_text("text", clip=rect).strip()
-                            row_data.append(self._clean_text(text))
-                        else:
-                            row_data.append("")
-                    data.append(row_data)
-
-                # Create DataFrame
-                if headers and data:
-                    # Process the table data into a DataFrame
-                    df = self._create_dataframe_from_table_data(headers, data, table_id)
-                    if df is not None:
-                        table_id += 1
+            if headers and data:
+                page_tables.append((headers, data))
+
+        return page_tables
+
+    def _words_in_rect(self, words, rect):
+        """
+        Join the page words whose centre lies inside rect, in reading order.
+
+        Args:
+            words (list): Output of page.get_text("words")
+            rect: Cell rectangle (fitz.Rect or an (x0, y0, x1, y1) tuple)
+
+        Returns:
+            str: Text of the cell
+        """
+        x0, y0, x1, y1 = rect
+        # Plain float comparisons; Rect containment methods are slow in a tight loop
+        return ' '.join(
+            word[4] for word in words
+            if x0 <= (word[0] + word[2]) / 2 <= x1 and y0 <= (word[1] + word[3]) / 2 <= y1
+        )
 
     def _extract_tables_from_text(self, doc, table_id):
         """Extract tables by analyzing text content for table structures."""
@@ -373,17 +520,20 @@ class DocumentParser:
             # This is a simplified approach - could be enhanced with more sophisticated table detection
             lines = text.split('\n')
 
+            # Count the delimiters of every line once; the end-of-table scans below reuse them
+            pipe_counts = [line.count('|') for line in lines]
+            tab_counts = [line.count('\t') for line in lines]
+
             # Look for potential table header rows - lines with multiple "|" or tab characters
-            table_start_indices = []
-            for i, line in enumerate(lines):
-                if line.count('|') > 2 or line.count('\t') > 2:
-                    table_start_indices.append(i)
+            table_start_indices = [
+                i for i in range(len(lines)) if pipe_counts[i] > 2 or tab_counts[i] > 2
+            ]
 
             # Process each potential table
             for start_idx in table_start_indices:
                 # Look for the end of the table
                 end_idx = start_idx + 1
-                while end_idx < len(lines) and (lines[end_idx].count('|') > 1 or lines[end_idx].count('\t') > 1):
+                while end_idx < len(lines) and (pipe_counts[end_idx] > 1 or tab_counts[end_idx] > 1):
                     end_idx += 1
 
                 # If the table has at least a header and one data row
@@ -397,7 +547,8 @@ class DocumentParser:
                     headers = [col.strip() for col in table_lines[0].split(delimiter) if col.strip()]
                     data = []
                     for line in table_lines[1:]:
-                        row_data = [col.strip() for col in line.split(delimiter)]
+                        # Columns past the header count are dropped below, so don't split them
+                        row_data = [col.strip() for col in line.split(delimiter, len(headers))]
                         # Ensure row has same number of columns as header
                         if len(row_data) < len(headers):
                             row_data.extend([''] * (len(headers) - len(row_data)))
@@ -417,32 +568,15 @@ class DocumentParser:
         while len(headers) < max(len(row) for row in data if row):
             headers.append(f"Column_{len(headers) + 1}")
 
-        # Make sure data rows have same length as headers
-        uniform_data = []
-        for row in data:
-            # Pad or truncate row to match headers length
-            if len(row) < len(headers):
-                row = row + [''] * (len(headers) - len(row))
-            elif len(row) > len(headers):
-                row = row[:len(headers)]
-            uniform_data.append(row)
-
         # Create DataFrame
         try:
-            df = pd.DataFrame(uniform_data, columns=headers)
+            df = _frame_from_rows(headers, data)
 
             # Check for "Conversation" or similar column (case insensitive)
-            has_conversation = False
-            conversation_col = None
-
-            for col in df.columns:
-                # Check if column name contains "conversation" (case insensitive)
-                col_lower = str(col).lower()
-                if 'conversation' in col_lower or col_lower == 'conv' or col_lower == 'table':
-                    has_conversation = True
-                    conversation_col = col
-                    self.log_debug(f"Found conversation column: '{col}'")
-                    break
+            conversation_col = _find_column(df.columns, _CONVERSATION_COL_RE)
+            has_conversation = conversation_col is not None
+            if has_conversation:
+                self.log_debug(f"Found conversation column: '{conversation_col}'")
 
             self.tables.append({
                 'id': table_id,
@@ -468,14 +602,20 @@ class DocumentParser:
 
             df = table['dataframe']
 
+            # Which cells mention 'conversation', computed once per column (literal match, no regex)
+            conversation_hits = {}
+
+            def get_hits(col):
+                if col not in conversation_hits:
+                    values = df[col].astype(str).str.lower()
+                    conversation_hits[col] = values.str.contains('conversation', regex=False)
+                return conversation_hits[col]
+
             # Check for any column that might be the 'table type' column
             for col in df.columns:
                 if 'table' in str(col).lower():
                     # Check if this column contains any 'conversation' values
-                    values = df[col].astype(str).str.lower()
-                    has_conversation_values = values.str.contains('conversation').any()
-
-                    if has_conversation_values:
+                    if get_hits(col).any():
                         self.log_debug(f"Found table with '{col}' column containing 'conversation' values")
                         table['has_conversation_column'] = True
                         table['conversation_column'] = col
@@ -484,12 +624,8 @@ class DocumentParser:
             # If still not found, look for a column with 'Conversation' in most of its values
             if not table['has_conversation_column']:
                 for col in df.columns:
-                    # Check each string value in this column
-                    values = df[col].astype(str).str.lower()
-                    conversation_count = values.str.contains('conversation').sum()
-
                     # If 'conversation' appears in many of the values, this might be our column
-                    if conversation_count > len(df) * 0.5:  # More than 50% have 'conversation'
+                    if get_hits(col).sum() > len(df) * 0.5:  # More than 50% have 'conversation'
                         self.log_debug(f"Found table with column '{col}' containing mostly 'conversation' values")
                         table['has_conversation_column'] = True
                         table['conversation_column'] = col
@@ -504,207 +640,12 @@ class DocumentParser:
         """
         return [t for t in self.tables if t['has_conversation_column']]
 
-    def match_content_with_mxliff(self, mxliff_data):
-        """
-        Match content from tables with source text in MXLIFF data.
-
-        Args:
-            mxliff_data (list): List of processed data from MXLIFF parser
-
-        Returns:
-            dict: Dictionary with matches and updates to apply
-        """
-        import time
-        import os
-        from difflib import SequenceMatcher
-
-        start_time = time.time()
-        debug_log_path = os.path.join(os.path.dirname(__file__), 'match_debug.log')
-
-        with open(debug_log_path, 'w', encoding='utf-8') as debug_log:
-            debug_log.write(f"Matching started at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            debug_log.write("=" * 50 + "\n")
-
-            # Ensure we have tables to process
-            if not self.tables:
-                debug_log.write("No tables found in the document.\n")
-                return {'matches': 0, 'updates': []}
-
-            # Get conversation tables
-            conversation_tables = self.get_conversation_tables()
-            if not conversation_tables:
-                debug_log.write("No conversation tables found.\n")
-                return {'matches': 0, 'updates': []}
-
-            # Preprocess MXLIFF items
-            mxliff_items = {}
-            for data in mxliff_data:
-                if not data.get('is_header', True) and 'item' in data:
-                    item = data['item']
-                    source_text = item.get('source_text', '').strip()
-                    if source_text:
-                        # Use cleaned text as key for more robust matching
-                        clean_source = self._clean_text_for_comparison(source_text)
-                        mxliff_items[clean_source] = {
-                            'original_text': source_text,
-                            'item': item
-                        }
-
-            debug_log.write(f"Total MXLIFF items: {len(mxliff_items)}\n")
-            debug_log.write(f"Conversation tables: {len(conversation_tables)}\n")
-
-            updates = []
-            match_count = 0
-
-            # Iterate through conversation tables
-            for table_index, table in enumerate(conversation_tables, 1):
-                df = table['dataframe']
-                debug_log.write(f"\nProcessing Table {table_index}:\n")
-
-                # Find Source and COTeam Comments columns
-                source_col = None
-                comments_col = None
-
-                for col in df.columns:
-                    col_str = str(col).lower()
-                    if 'source' in col_str:
-                        source_col = col
-                    elif ('coteam' in col_str and 'comment' in col_str) or (
-                            'comment' in col_str and 'coteam' in col_str):
-                        comments_col = col
-
-                # Fallback comments column detection
-                if not comments_col:
-                    comments_col = next((col for col in df.columns if 'comment' in str(col).lower()), None)
-
-                if not source_col or not comments_col:
-                    debug_log.write("Skipping table - required columns not found\n")
-                    continue
-
-                # Batch process the table rows
-                for row_index, row in df.iterrows():
-                    source_text = str(row[source_col]).strip()
-                    comment_text = str(row[comments_col]).strip()
-
-                    # Skip empty entries
-                    if not source_text or not comment_text:
-                        continue
-
-                    # Clean source text
-                    clean_source = self._clean_text_for_comparison(source_text)
-
-                    # Exact match
-                    if clean_source in mxliff_items:
-                        match_data = mxliff_items[clean_source]
-                        update_entry = {
-                            'key': match_data['item'].get('key', ''),
-                            'source_text': clean_source,
-                            'comment': comment_text,
-                            'match_type': 'exact'
-                        }
-                        updates.append(update_entry)
-                        match_count += 1
-                        debug_log.write(f"Exact Match: {clean_source[:100]}...\n")
-                        continue
-
-                    # Fuzzy matching with optimization
-                    best_match = None
-                    best_ratio = 0.8  # Similarity threshold
-
-                    for mxliff_source, mxliff_data in mxliff_items.items():
-                        # Skip very short strings
-                        if len(clean_source) < 10 or len(mxliff_source) < 10:
-                            continue
-
-                        # Use SequenceMatcher for more efficient similarity calculation
-                        ratio = SequenceMatcher(None, clean_source, mxliff_source).ratio()
-
-                        if ratio > best_ratio:
-                            best_ratio = ratio
-                            best_match = mxliff_data
-
-                    if best_match:
-                        update_entry = {
-                            'key': best_match['item'].get('key', ''),
-                            'source_text': best_match['original_text'],
-                            'comment': comment_text,
-                            'match_type': 'fuzzy',
-                            'match_ratio': best_ratio
-                        }
-                        updates.append(update_entry)
-                        match_count += 1
-                        debug_log.write(f"Fuzzy Match: {clean_source[:100]}... (Ratio: {best_ratio})\n")
-
-            # Final logging
-            debug_log.write("\n" + "=" * 50 + "\n")
-            debug_log.write(f"Total matches found: {match_count}\n")
-            debug_log.write(f"Total time taken: {time.time() - start_time:.2f} seconds\n")
-
-        print(f"Matching completed. Debug log saved to {debug_log_path}")
-
-        return {
-            'matches': match_count,
-            'updates': updates
-        }
-
-
-
-    @functools.lru_cache(maxsize=1000)
     def _clean_text_for_comparison(self, text):
         """Cached and optimized text cleaning with memoization."""
         if not text:
             return ""
 
-        text = str(text).strip()
-
-        try:
-            text = re.sub(r'[''‚‛""„‟\x00-\x1F\x7F]', lambda m: {
-                ''': "'", ''': "'",
-                '"': '"', '"': '"'
-            }.get(m.group(0), ' '), text)
-        except Exception as e:
-            print(f"Error cleaning text: {e}")
-            return text
-
-        return re.sub(r'\s+', ' ', text).strip()
-
-    def _clean_text_for_comparison(self, text):
-        """
-        Clean and normalize text for comparison purposes.
-
-        Args:
-            text (str): Input text to clean
-
-        Returns:
-            str: Cleaned and normalized text
-        """
-        # Handle None or empty input
-        if text is None:
-            return ""
-
-        # Convert to string and strip whitespace
-        text = str(text).strip()
-
-        # Handle empty string after stripping
-        if not text:
-            return ""
-
-        try:
-            # Replace various quote characters and normalize
-            text = re.sub(r'[''‚‛""„‟\x00-\x1F\x7F]', lambda m: {
-                ''': "'",   # Left single quote
-                ''': "'",  # Right single quote
-                '"': '"',  # Left double quote
-                '"': '"',  # Right double quote
-            }.get(m.group(0), ' '), text)
-
-            # Normalize whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-        except Exception as e:
-            print(f"Error cleaning text: {e}")
-            return text
-
-        return text
+        return _clean_for_comparison(str(text))
 
     def _clean_text(self, text):
         """
@@ -722,33 +663,30 @@ class DocumentParser:
         # Convert to string
         text = str(text)
 
-        # Replace non-breaking spaces and other problematic whitespace
-        text = text.replace('\xa0', ' ')
-
-        # Remove control characters
-        text = ''.join(c if ord(c) >= 32 or c in '\n\r\t' else ' ' for c in text)
+        # Replace non-breaking spaces and control characters in one C-level pass
+        text = _CTRL_RE.sub(' ', text)
 
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Normalize whitespace (str.split uses the same whitespace set as \s)
+        text = ' '.join(text.split())
 
         return text
 
-    # Ensure other methods that might use these cleaning methods are present
     def match_content_with_mxliff(self, mxliff_data):
-        import time
-        import os
-        from difflib import SequenceMatcher
+        """
+        Match content from tables with source text in MXLIFF data.
+
+        Args:
+            mxliff_data (list): List of processed data from MXLIFF parser
 
+        Returns:
+            dict: Dictionary with matches and updates to apply
+        """
         start_time = time.time()
 
         # Early quick checks
         if not mxliff_data or not self.tables:
             return {'matches': 0, 'updates': []}
 
-        # Efficient preprocessing
-        def preprocess_text(text):
-            return self._clean_text_for_comparison(str(text).strip())
-
         # Create efficient lookup structures
         mxliff_lookup = {}
         for data in mxliff_data:
@@ -756,7 +694,8 @@ class DocumentParser:
                 item = data['item']
                 source_text = str(item.get('source_text', '')).strip()
                 if source_text:
-                    clean_source = preprocess_text(source_text)
+                    # Already a stripped str, so clean it directly without re-coercing
+                    clean_source = _clean_for_comparison(source_text)
                     if len(clean_source) >= 10:  # Filter very short texts
                         mxliff_lookup[clean_source] = {
                             'key': item.get('key', ''),
@@ -772,33 +711,77 @@ class DocumentParser:
         if not conversation_tables:
             return {'matches': 0, 'updates': []}
 
+        # Fuzzy candidate index, only built once a row actually misses the exact lookup;
+        # documents that match exactly throughout never pay for it
+        sources_by_len = source_bitmaps = None
+
+        # Cleaned text per distinct row source and fuzzy match results per cleaned
+        # source, so text repeated across rows and tables is only processed once
+        clean_sources = {}
+        fuzzy_results = {}
+
         # Optimized matching with early stopping
         updates = []
         match_count = 0
         MAX_MATCHES = 500  # Prevent unlimited matches
 
+        # Match details are only formatted when debugging is enabled
+        debug_lines = [] if DEBUG_MATCH else None
+        if debug_lines is not None:
+            debug_lines.append(f"Matching started at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            debug_lines.append("=" * 50 + "\n")
+            debug_lines.append(f"Total MXLIFF items: {len(mxliff_lookup)}\n")
+            debug_lines.append(f"Conversation tables: {len(conversation_tables)}\n")
+
         for table in conversation_tables:
+            # Once the cap is hit, skip the column and cleaning work of the remaining tables too
+            if match_count >= MAX_MATCHES:
+                break
+
             df = table['dataframe']
 
             # Smart column detection
-            source_col = next((col for col in df.columns if 'source' in str(col).lower()), None)
-            comments_col = next((col for col in df.columns if 'comment' in str(col).lower()), None)
+            source_col = _find_column(df.columns, _SOURCE_COL_RE)
+            comments_col = _find_column(df.columns, _COMMENT_COL_RE)
 
             if not source_col or not comments_col:
                 continue
 
-            for _, row in df.iterrows():
+            # Pull both columns out once instead of boxing every row into a Series,
+            # and drop rows missing either text with one vectorized mask. map(str) rather than
+            # astype(str): pandas' string dtype keeps NaN as a float, which the cleaners reject
+            sources = df[source_col].map(str).str.strip()
+            comments = df[comments_col].map(str).str.strip()
+            usable = (sources != '') & (comments != '')
+
+            # Clean the usable rows first, so the table's new fuzzy queries can be scored in one batch
+            rows = []
+            for source_text, comment_text in zip(sources[usable].tolist(), comments[usable].tolist()):
+                clean_source = clean_sources.get(source_text)
+                if clean_source is None:
+                    # Stripped, non-empty str from the column pass; no wrapper needed
+                    clean_source = clean_sources[source_text] = _clean_for_comparison(source_text)
+                # Every lookup key has at least 10 characters, so shorter rows can
+                # match neither exactly nor fuzzily
+                if len(clean_source) >= 10:
+                    rows.append((clean_source, comment_text))
+
+            # Fuzzy matching; repeated source sentences are only matched once
+            pending = {
+                clean_source for clean_source, _ in rows
+                if clean_source not in mxliff_lookup and clean_source not in fuzzy_results
+            }
+            if pending:
+                if sources_by_len is None:
+                    sources_by_len, source_bitmaps = self._build_fuzzy_index(mxliff_lookup)
+                fuzzy_results.update(self._find_fuzzy_matches(
+                    pending, sources_by_len, mxliff_lookup, source_bitmaps
+                ))
+
+            for clean_source, comment_text in rows:
                 if match_count >= MAX_MATCHES:
                     break
 
-                source_text = str(row[source_col]).strip()
-                comment_text = str(row[comments_col]).strip()
-
-                if not source_text or not comment_text:
-                    continue
-
-                clean_source = preprocess_text(source_text)
-
                 # Exact match
                 if clean_source in mxliff_lookup:
                     match_data = mxliff_lookup[clean_source]
@@ -809,27 +792,11 @@ class DocumentParser:
                         'match_type': 'exact'
                     })
                     match_count += 1
+                    if debug_lines is not None:
+                        debug_lines.append(f"Exact Match: {clean_source[:100]}...\n")
                     continue
 
-                # Fuzzy matching with early stopping
-                best_match = None
-                best_ratio = 0.8  # Similarity threshold
-
-                for mxliff_source, mxliff_data in mxliff_lookup.items():
-                    # Skip very short strings and improve matching efficiency
-                    if len(clean_source) < 10 or len(mxliff_source) < 10:
-                        continue
-
-                    # Quick length-based filtering before detailed comparison
-                    if abs(len(clean_source) - len(mxliff_source)) > 5:
-                        continue
-
-                    # Faster similarity calculation
-                    ratio = SequenceMatcher(None, clean_source, mxliff_source).ratio()
-
-                    if ratio > best_ratio:
-                        best_ratio = ratio
-                        best_match = mxliff_data
+                best_match, best_ratio = fuzzy_results[clean_source]
 
                 if best_match:
                     updates.append({
@@ -840,17 +807,143 @@ class DocumentParser:
                         'match_ratio': best_ratio
                     })
                     match_count += 1
+                    if debug_lines is not None:
+                        debug_lines.append(f"Fuzzy Match: {clean_source[:100]}... (Ratio: {best_ratio})\n")
 
         # Performance logging
-        print(f"Matching completed: {match_count} matches in {time.time() - start_time:.2f} seconds")
+        print(f"Matching completed: {match_count} matches in {time.time() - start_time:.2f} seconds"
+              f" ({len(fuzzy_results)} distinct sources needed fuzzy matching)")
+
+        if debug_lines is not None:
+            debug_lines.append("\n" + "=" * 50 + "\n")
+            debug_lines.append(f"Total matches found: {match_count}\n")
+            debug_lines.append(f"Total time taken: {time.time() - start_time:.2f} seconds\n")
+
+            # One write for the whole log instead of one per matched row
+            debug_log_path = os.path.join(os.path.dirname(__file__), 'match_debug.log')
+            with open(debug_log_path, 'w', encoding='utf-8') as debug_log:
+                debug_log.write(''.join(debug_lines))
 
         return {
             'matches': match_count,
             'updates': updates
         }
 
-    def _similarity_ratio(self, str1, str2):
-        """Calculate similarity ratio between two strings."""
-        # Simple implementation using longest common subsequence
-        import difflib
-        return difflib.SequenceMatcher(None, str1, str2).ratio()
+    def _build_fuzzy_index(self, mxliff_lookup):
+        """
+        Index the MXLIFF sources for fuzzy matching.
+
+        Args:
+            mxliff_lookup (dict): Cleaned MXLIFF source -> match data
+
+        Returns:
+            tuple: (length -> [(order, source)] buckets, source -> character bitmap or None)
+        """
+        # Every lookup key is already at least 10 characters long. Entries keep their
+        # lookup order so ties between equally good candidates resolve as before.
+        sources_by_len = defaultdict(list)
+        for order, mxliff_source in enumerate(mxliff_lookup):
+            sources_by_len[len(mxliff_source)].append((order, mxliff_source))
+
+        # Without rapidfuzz, character bitmaps let the difflib fallback discard
+        # most candidates before any per-character work
+        source_bitmaps = None
+        if fuzzy_process is None:
+            source_bitmaps = {mxliff_source: _char_bitmap(mxliff_source) for mxliff_source in mxliff_lookup}
+
+        return sources_by_len, source_bitmaps
+
+    def _find_fuzzy_matches(self, queries, sources_by_len, mxliff_lookup, source_bitmaps=None):
+        """
+        Find the most similar MXLIFF source for each cleaned table source.
+
+        Args:
+            queries (iterable): Cleaned source texts of table rows
+            sources_by_len (dict): Length -> [(order, source)] buckets of mxliff_lookup
+            mxliff_lookup (dict): Cleaned MXLIFF source -> match data
+            source_bitmaps (dict): Optional cleaned MXLIFF source -> character bitmap
+
+        Returns:
+            dict: Query -> (match data or None, similarity ratio)
+        """
+        results = {}
+
+        # Queries of the same length share the same candidate window
+        queries_by_len = defaultdict(list)
+        for query in queries:
+            queries_by_len[len(query)].append(query)
+
+        for source_len, group in queries_by_len.items():
+            # Quick length-based filtering: only the buckets within 5 characters
+            candidates = [
+                mxliff_source for _, mxliff_source in heapq.merge(*(
+                    sources_by_len[length]
+                    for length in range(source_len - 5, source_len + 6)
+                    if length in sources_by_len
+                ))
+            ]
+
+            if fuzzy_process is not None and candidates:
+                # Score the whole group against its window in one C++ call, spread over
+                # all cores without the GIL; scores below the cutoff come back as 0
+                scores = fuzzy_process.cdist(
+                    group, candidates, scorer=fuzz.ratio, processor=None,
+                    score_cutoff=FUZZY_THRESHOLD * 100, dtype=np.float64, workers=-1
+                )
+                # argmax picks the first of equal scores, i.e. the earliest lookup entry
+                best_indexes = scores.argmax(axis=1)
+                for query, row_scores, best_index in zip(group, scores, best_indexes):
+                    best_score = row_scores[best_index]
+                    if best_score > FUZZY_THRESHOLD * 100:
+                        results[query] = (mxliff_lookup[candidates[best_index]], float(best_score) / 100)
+                    else:
+                        results[query] = (None, FUZZY_THRESHOLD)
+            else:
+                for query in group:
+                    results[query] = self._find_fuzzy_match(query, candidates, mxliff_lookup, source_bitmaps)
+
+        return results
+
+    def _find_fuzzy_match(self, clean_source, candidates, mxliff_lookup, source_bitmaps=None):
+        """
+        Find the most similar candidate with difflib; used when rapidfuzz is not installed.
+
+        Args:
+            clean_source (str): Cleaned source text of the table row
+            candidates (list): Cleaned MXLIFF sources to compare against, in lookup order
+            mxliff_lookup (dict): Cleaned MXLIFF source -> match data
+            source_bitmaps (dict): Optional cleaned MXLIFF source -> character bitmap
+
+        Returns:
+            tuple: (match data or None, similarity ratio)
+        """
+        best_match = None
+        best_ratio = FUZZY_THRESHOLD
+        source_len = len(clean_source)
+        query_bitmap = _char_bitmap(clean_source) if source_bitmaps is not None else 0
+
+        matcher = SequenceMatcher(None, clean_source)
+        for mxliff_source in candidates:
+            matcher.set_seq2(mxliff_source)
+            # Cheap upper bounds first; only run the full ratio when it could still win
+            if matcher.real_quick_ratio() <= best_ratio:
+                continue
+            if source_bitmaps is not None:
+                # A character whose bit the other string lacks can never be matched,
+                # so every such bit costs each side at least one character
+                candidate_bitmap = source_bitmaps[mxliff_source]
+                matchable = min(
+                    source_len - bin(query_bitmap & ~candidate_bitmap).count('1'),
+                    len(mxliff_source) - bin(candidate_bitmap & ~query_bitmap).count('1')
+                )
+                if 2.0 * matchable / (source_len + len(mxliff_source)) <= best_ratio:
+                    continue
+            if matcher.quick_ratio() <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_match = mxliff_lookup[mxliff_source]
+
+        return best_match, best_ratio
@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 
 # Add the current directory to Python's path if not already there
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,4 +28,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    # Required for the PDF page worker processes in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
@@ -2,7 +2,6 @@ import os
 import sys
 import re
 import traceback
-import codecs
 import webbrowser
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QWidget, QFileDialog,
                            QTableWidgetItem, QMessageBox, QStatusBar, QHeaderView,
@@ -14,19 +13,20 @@ from PyQt5.QtGui import QFont, QColor, QPainter
 
 from ui.theme import ThemeManager
 from ui.ui_components import UIComponents
-from ui.custom_widgets import TranslationDiffDialog
+from ui.custom_widgets import TranslationDiffDialog, INFO_ICON_ROLE, HAS_COMMENT_ROLE
 from utils.utils import (extract_main_key, extract_line_number, has_comments,
                          get_comment_text, natural_sort_key, find_text_differences)
 from utils.xml_parser import XMLParser
 from utils.document_parser import DocumentParser
 from utils.FileProcessingWorker import FileProcessingWorker
-from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 from openpyxl.comments import Comment
 import pandas
 
 class MXLIFFParser(QMainWindow):
+    # Info icon shared by every row, rendered on first use
+    _INFO_PIXMAP = None
+
     def __init__(self):
         super().__init__()
 
@@ -65,13 +65,14 @@ class MXLIFFParser(QMainWindow):
         self.current_theme = self.light_theme
 
         # Add these variables for caching
-        self.original_xml_content = None  # Store the original XML content
-        self.current_file_path = None  # Store the current file path
+        self.current_file_path = None  # Store the current file path (re-read on export)
 
         # Initialize variables
         self.group_headers = []
         self.group_rows = {}
         self.processed_data = []  # Store the processed data for reuse
+        self._items_by_key = {}  # First data item of each key in processed_data
+        self._dirty_keys = set()  # Keys whose target text differs from the original
         self.diff_pairs = {}  # Store pairs of related translations
         self.updating_cell = False  # Flag to prevent recursive editing
 
@@ -79,257 +80,78 @@ class MXLIFFParser(QMainWindow):
 
     # Add these methods to your MXLIFFParser class
 
-    def open_file(self):
-        """Open an MXLIFF file and parse it."""
-        # Check for unsaved changes
-        if self.has_unsaved_changes():
-            reply = QMessageBox.question(
-                self,
-                "Unsaved Changes",
-                "You have unsaved changes. Do you want to save them before opening a new file?",
-                QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
-                QMessageBox.Save
-            )
-
-            if reply == QMessageBox.Save:
-                self.export_file()
-                # If user cancels during export, abort opening
-                if self.has_unsaved_changes():
-                    return
-            elif reply == QMessageBox.Cancel:
-                return
-
-        options = QFileDialog.Options()
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Open MXLIFF File",
-            "",
-            "MXLIFF Files (*.mxliff *.xml);;All Files (*)",
-            options=options
-        )
-
-        if file_path:
-            self.log(f"Opening file: {file_path}")
-            self.file_label.setText(os.path.basename(file_path))
-
-            # Start processing in a worker thread
-            self._start_xml_parsing(file_path)
-
-    def _start_xml_parsing(self, file_path):
-        """Start XML parsing in a worker thread."""
-        # Show progress bar
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.progress_bar.setRange(0, 100)  # Set to determinate mode
-        self.statusBar.showMessage("Processing file...")
-
-        # Clear previous results
-        self.table.setRowCount(0)
-        self.processed_data = []
-        self.diff_pairs = {}
+    @classmethod
+    def _info_pixmap(cls):
+        """Return the info icon pixmap, drawing it once for the whole app."""
+        from PyQt5.QtGui import QPixmap
+
+        if cls._INFO_PIXMAP is None:
+            # Create the icon programmatically (since we can't include external images)
+            pixmap = QPixmap(24, 24)
+            pixmap.fill(Qt.transparent)
+
+            # Draw the info icon
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+
+            # Draw circle
+            painter.setPen(Qt.black)
+            painter.setBrush(Qt.white)
+            painter.drawEllipse(2, 2, 20, 20)
+
+            # Draw 'i' letter
+            font = QFont("Arial", 14, QFont.Bold)
+            painter.setFont(font)
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, "i")
+            painter.end()
 
-        # Create worker thread
-        self.worker = FileProcessingWorker(file_path, 'parse_xml', self)
+            cls._INFO_PIXMAP = pixmap
 
-        # Connect signals
-        self.worker.progress_signal.connect(self._update_progress)
-        self.worker.finished_signal.connect(self._on_xml_parsed)
-        self.worker.error_signal.connect(self._on_worker_error)
-
-        # Start worker
-        self.worker.start()
+        return cls._INFO_PIXMAP
 
     def create_info_icon(self, row, column, tooltip=""):
-        """Create an info icon in the specified cell with optional tooltip."""
-        from PyQt5.QtGui import QIcon, QPixmap
-        from PyQt5.QtCore import QSize, Qt
-
-        # Create a label widget to hold the icon
-        from PyQt5.QtWidgets import QLabel
-
-        icon_label = QLabel()
-        icon_label.setAlignment(Qt.AlignCenter)
-
-        # Create the icon programmatically (since we can't include external images)
-        pixmap = QPixmap(24, 24)
-        pixmap.fill(Qt.transparent)
-
-        # Draw the info icon
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        # Draw circle
-        painter.setPen(Qt.black)
-        painter.setBrush(Qt.white)
-        painter.drawEllipse(2, 2, 20, 20)
-
-        # Draw 'i' letter
-        font = QFont("Arial", 14, QFont.Bold)
-        painter.setFont(font)
-        painter.drawText(pixmap.rect(), Qt.AlignCenter, "i")
-        painter.end()
-
-        # Set the icon
-        icon_label.setPixmap(pixmap)
+        """Flag the specified cell to show the info icon, with optional tooltip."""
+        # TableCellDelegate, installed on the Info column, paints the shared pixmap into flagged cells
+        icon_item = QTableWidgetItem("")
+        icon_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+        icon_item.setData(INFO_ICON_ROLE, True)
 
         # Set tooltip if provided
         if tooltip:
-            icon_label.setToolTip(tooltip)
+            icon_item.setToolTip(tooltip)
 
-        # Add the label to the table
-        self.table.setCellWidget(row, column, icon_label)
+        self.table.setItem(row, column, icon_item)
 
-        return icon_label
+        return icon_item
 
     def _update_progress(self, value, message):
         """Update progress bar and status message."""
         self.progress_bar.setValue(value)
         self.statusBar.showMessage(message)
 
-        # Process events to keep UI responsive during progress updates
-        QApplication.processEvents()
-
-    def _on_xml_parsed(self, result):
-        # Code processing the result...
-
-        # Enable export controls now that we have a file loaded
-        if hasattr(self, 'export_button'):
-            self.export_button.setEnabled(True)
-            self.log("MXLIFF export button enabled")
-        if hasattr(self, 'export_action'):
-            self.export_action.setEnabled(True)
-
-        # Enable Excel export controls - add debug logging
-        if hasattr(self, 'export_excel_button'):
-            self.export_excel_button.setEnabled(True)
-            self.log("Excel export button enabled")
-        if hasattr(self, 'export_excel_action'):
-            self.export_excel_action.setEnabled(True)
-            self.log("Excel export action enabled")
-
-        # Also enable the button in the regular file loading method
-        if hasattr(self, '_process_file'):
-            # After successful loading
-            if hasattr(self, 'export_excel_button'):
-                self.export_excel_button.setEnabled(True)
-                self.log("Excel export button enabled in _process_file")
-
-    def _on_worker_error(self, error_message):
-        """Handle worker thread errors."""
-        # Hide progress bar
-        self.progress_bar.setVisible(False)
-
-        # Update status
-        self.statusBar.showMessage("Error processing file", 5000)
-        self.file_label.setText(f"Error loading file")
-
-        # Log error
-        self.log(f"Worker error: {error_message}")
-
-        # Show error message
-        QMessageBox.critical(
-            self,
-            "Error Processing File",
-            f"An error occurred while processing the file:\n\n{error_message}"
-        )
-
-    def update_comments_in_display(self, updated_keys):
-        """Update only the items with new comments without rebuilding the entire table."""
-        if not updated_keys:
-            return  # Nothing to update
-
-        # Find the rows that need updating
-        key_col = self.column_map.get('Key', 0)
-        source_col = self.column_map.get('Source Text', 2)
-
-        for row in range(self.table.rowCount()):
-            key_item = self.table.item(row, key_col)
-            if not key_item:
-                continue
-
-            key_text = key_item.text()
-            if key_text in updated_keys:
-                # Find the corresponding data item
-                data_item = None
-                for data in self.processed_data:
-                    if not data.get('is_header', True) and 'item' in data:
-                        item = data['item']
-                        if item.get('key', '') == key_text:
-                            data_item = item
-                            break
-
-                if data_item:
-                    # Update tooltip with new note text
-                    has_comment = has_comments(data_item)
-                    tooltip_text = data_item.get('note_text', '')
-                    if has_comment:
-                        comment_text = get_comment_text(data_item)
-                        tooltip_text = f"{comment_text}\n\n{tooltip_text}"
-
-                    # Update all cells in this row with the new tooltip
-                    for col in range(self.table.columnCount()):
-                        cell = self.table.item(row, col)
-                        if cell:
-                            cell.setToolTip(tooltip_text)
-
-                    # Add a visual indicator that this item has comments in the Source Text column
-                    if source_col >= 0:
-                        source_item = self.table.item(row, source_col)
-                        if source_item:
-                            current_text = source_item.text()
-                            if has_comment and not current_text.startswith('💬 '):
-                                source_item.setText("💬 " + current_text.replace('💬 ', ''))
-                            elif not has_comment and current_text.startswith('💬 '):
-                                # Remove icon if comment was removed
-                                source_item.setText(current_text.replace('💬 ', ''))
-
-    def export_file(self):
-        """Export the updated MXLIFF file with edited translations."""
-        if not self.original_xml_content or not self.current_file_path:
-            QMessageBox.warning(
-                self,
-                "Export Error",
-                "No file is currently loaded or the original content is missing."
-            )
-            return
-
-        # Check if we have any changes to export
-        has_changes = False
+    def _index_processed_data(self):
+        """Rebuild the key index and the set of edited keys from processed_data."""
+        self._items_by_key = {}
+        self._dirty_keys = set()
         for data in self.processed_data:
             if not data.get('is_header', True) and 'item' in data:
                 item = data['item']
-                if 'target_text' in item and 'original_target_text' in item:
-                    if item['target_text'] != item['original_target_text']:
-                        has_changes = True
-                        break
-
-        if not has_changes:
-            reply = QMessageBox.question(
-                self,
-                "No Changes Detected",
-                "No changes to translations were detected. Do you still want to export the file?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            if reply == QMessageBox.No:
-                return
-
-        # Choose where to save the file
-        options = QFileDialog.Options()
-        default_name = "edited_" + os.path.basename(self.current_file_path)
-        save_path, _ = QFileDialog.getSaveFileName(
-            self,
-            "Export MXLIFF File",
-            default_name,
-            "MXLIFF Files (*.mxliff *.xml);;All Files (*)",
-            options=options
-        )
-
-        if not save_path:
-            return  # User cancelled
+                key = item.get('key', '')
+                self._items_by_key.setdefault(key, item)
+                # Missing-line placeholders never round-trip to the file
+                if not key or item.get('is_missing_line', False):
+                    continue
+                if item.get('target_text', '') != item.get('original_target_text', item.get('target_text', '')):
+                    self._dirty_keys.add(key)
 
-        # Start export in worker thread
-        self._start_export(save_path)
+    def _rows_with_keys(self, key_col, keys):
+        """Yield (row, key) for every table row whose key is one of the given keys."""
+        for row in range(self.table.rowCount()):
+            key_item = self.table.item(row, key_col)
+            if key_item:
+                key_text = key_item.text()
+                if key_text in keys:
+                    yield row, key_text
 
     def _start_export(self, save_path):
         """Start export in a worker thread."""
@@ -342,14 +164,26 @@ class MXLIFFParser(QMainWindow):
         # Create worker thread
         self.worker = FileProcessingWorker(save_path, 'export_file', self)
 
-        # Set data needed for export
-        self.worker.set_data('processed_data', self.processed_data)
-        self.worker.set_data('original_xml_content', self.original_xml_content)
+        # Set data needed for export; a shallow copy, so reloading a file cannot
+        # swap the list out from under the worker
+        processed_data = list(self.processed_data)
+        self.worker.set_data('processed_data', processed_data)
+        self.worker.set_data('source_file_path', self.current_file_path)
+
+        # Count the edited items in the same snapshot, so the summary matches what is written
+        edited_count = 0
+        for data in processed_data:
+            if not data.get('is_header', True) and 'item' in data:
+                item = data['item']
+                if 'target_text' in item and 'original_target_text' in item:
+                    if item['target_text'] != item['original_target_text']:
+                        edited_count += 1
+        self.worker.set_data('edited_count', edited_count)
 
         # Connect signals
         self.worker.progress_signal.connect(self._update_progress)
         self.worker.finished_signal.connect(self._on_export_completed)
-        self.worker.error_signal.connect(self._on_worker_error)
+        self.worker.error_signal.connect(self._on_export_error)
 
         # Start worker
         self.worker.start()
@@ -389,14 +223,9 @@ class MXLIFFParser(QMainWindow):
                 self.log("User cancelled file dialog")
                 return  # User cancelled
 
-            # Show progress
+            # Write the workbook on the thread pool so the window and progress bar stay live
             self.log(f"Starting export to {save_path}")
-            self.progress_bar.setVisible(True)
-            self.statusBar.showMessage("Exporting to Excel...")
-
-            # We'll export in a timer to allow UI to update
-            self.log("Setting up timer for _process_excel_export")
-            QTimer.singleShot(100, lambda: self._process_excel_export(save_path))
+            self._start_excel_export(save_path)
 
         except Exception as e:
             self.log(f"Error in export_to_excel: {str(e)}")
@@ -411,190 +240,209 @@ class MXLIFFParser(QMainWindow):
                 error_msg
             )
 
-    def _process_excel_export(self, save_path):
-        """Process the Excel export after a short delay to allow UI to update."""
-        try:
-            # Create a new workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "MXLIFF Data"
-
-            # Add an additional column for notes/comments
-            notes_column_name = "Additional Notes"
-
-            # Define column headers based on the current column order
-            headers = self.current_columns.copy()
-            headers.append(notes_column_name)  # Add notes column
-
-            for i, header in enumerate(headers, 1):
-                ws.cell(row=1, column=i, value=header)
-                ws.cell(row=1, column=i).font = Font(bold=True)
-                # Add a light gray background to header row
-                ws.cell(row=1, column=i).fill = PatternFill(start_color="D3D3D3", fill_type="solid")
-
-            # Get theme colors for formatting
-            group_header_color = self._excel_color_from_qcolor(QColor(self.current_theme['group_header']))
-            menu_label_color = self._excel_color_from_qcolor(QColor(self.current_theme['menu_label']))
-            female_key_color = self._excel_color_from_qcolor(QColor(self.current_theme['female_key']))
-            diff_text_color = self._excel_color_from_qcolor(QColor(self.current_theme.get('diff_text', '#FF0000')))
-
-            # Track current Excel row
-            excel_row = 2  # Start after the header row
-
-            # Process each row in the table and add to Excel
-            for row in range(self.table.rowCount()):
-                # Check if this is a header row
-                first_cell = self.table.item(row, 0)
-                if not first_cell:
-                    continue  # Skip empty rows
-
-                # Check if this is a group header
-                is_header = False
-                header_data = first_cell.data(Qt.UserRole) if first_cell else None
-                if header_data and isinstance(header_data, dict) and header_data.get('is_header'):
-                    is_header = True
-                    # Add group header as a merged cell
-                    header_text = first_cell.text()
-                    ws.cell(row=excel_row, column=1, value=header_text)
-                    # Apply header formatting
-                    header_cell = ws.cell(row=excel_row, column=1)
-                    header_cell.font = Font(bold=True)
-                    header_cell.fill = PatternFill(start_color=group_header_color,
-                                                   fill_type="solid")
-                    # Merge cells across all columns
-                    ws.merge_cells(start_row=excel_row, start_column=1, end_row=excel_row, end_column=len(headers))
-                    excel_row += 1
-                    continue
+    def _start_excel_export(self, save_path):
+        """Start the Excel export in a worker thread."""
+        # Show progress bar
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setRange(0, 100)  # Set to determinate mode
+        self.statusBar.showMessage("Exporting to Excel...")
 
-                # Check if this is a scene info row
-                if first_cell and 'Scene:' in first_cell.text() and self.table.columnSpan(row, 0) > 1:
-                    scene_text = first_cell.text()
-                    ws.cell(row=excel_row, column=1, value=scene_text)
-                    # Apply scene info formatting
-                    scene_cell = ws.cell(row=excel_row, column=1)
-                    scene_cell.font = Font(italic=True)
-                    lighter_color = self._lighten_excel_color(group_header_color)
-                    scene_cell.fill = PatternFill(start_color=lighter_color, fill_type="solid")
-                    # Merge cells across all columns
-                    ws.merge_cells(start_row=excel_row, start_column=1, end_row=excel_row, end_column=len(headers))
-                    excel_row += 1
-                    continue
+        # The rows are built here, where the theme and table state live; creating the
+        # cells and saving the workbook, the slow part, runs on the thread pool
+        headers, column_widths, rows = self._build_excel_rows()
 
-                # Check if this is a missing line row
-                if first_cell and '[MISSING LINE' in first_cell.text() and self.table.columnSpan(row, 0) > 1:
-                    missing_text = first_cell.text()
-                    ws.cell(row=excel_row, column=1, value=missing_text)
-                    # Apply missing line formatting
-                    missing_cell = ws.cell(row=excel_row, column=1)
-                    missing_cell.font = Font(bold=True, color="AA0000")
-                    missing_cell.fill = PatternFill(start_color="FFCCCC", fill_type="solid")
-                    missing_cell.alignment = Alignment(horizontal='center', vertical='center')
-                    # Merge cells across all columns
-                    ws.merge_cells(start_row=excel_row, start_column=1, end_row=excel_row, end_column=len(headers))
-                    excel_row += 1
+        # Create worker thread
+        self.worker = FileProcessingWorker(save_path, 'export_excel', self)
+        self.worker.set_data('headers', headers)
+        self.worker.set_data('column_widths', column_widths)
+        self.worker.set_data('rows', rows)
+
+        # Connect signals
+        self.worker.progress_signal.connect(self._update_progress)
+        self.worker.finished_signal.connect(self._on_excel_export_completed)
+        self.worker.error_signal.connect(self._on_excel_export_error)
+
+        # Start worker
+        self.worker.start()
+
+    def _build_excel_rows(self):
+        """
+        Lay out the Excel export from processed_data.
+
+        Cells are (value, font, fill, alignment) tuples, or plain values for
+        unstyled cells, so the worker can turn them into write-only cells.
+
+        Returns:
+            tuple: (header cells, column widths, [(cells, merged), ...] data rows)
+        """
+        # Add an additional column for notes/comments
+        notes_column_name = "Additional Notes"
+
+        # Define column headers based on the current column order
+        headers = self.current_columns.copy()
+        headers.append(notes_column_name)  # Add notes column
+
+        # Column widths must be set before the first row is written
+        column_widths = []
+        for col_name in headers:
+            if col_name in ['Source Text', 'Target Text', 'Additional Notes']:
+                # Make text columns wider
+                column_widths.append(60)
+            elif col_name == 'Char Info':
+                # Make character info column narrower
+                column_widths.append(15)
+            else:
+                # Default width for other columns
+                column_widths.append(25)
+
+        # Get theme colors for formatting
+        group_header_color = self._excel_color_from_qcolor(QColor(self.current_theme['group_header']))
+        menu_label_color = self._excel_color_from_qcolor(QColor(self.current_theme['menu_label']))
+        female_key_color = self._excel_color_from_qcolor(QColor(self.current_theme['female_key']))
+        diff_text_color = self._excel_color_from_qcolor(QColor(self.current_theme.get('diff_text', '#FF0000')))
+
+        # Styles are built once and shared by every cell that uses them
+        bold_font = Font(bold=True)
+        header_fill = PatternFill(start_color="D3D3D3", fill_type="solid")
+        group_header_fill = PatternFill(start_color=group_header_color, fill_type="solid")
+        scene_font = Font(italic=True)
+        scene_fill = PatternFill(start_color=self._lighten_excel_color(group_header_color), fill_type="solid")
+        missing_font = Font(bold=True, color="AA0000")
+        missing_fill = PatternFill(start_color="FFCCCC", fill_type="solid")
+        missing_alignment = Alignment(horizontal='center', vertical='center')
+        data_alignment = Alignment(wrap_text=True, vertical='top')
+        diff_font = Font(color=diff_text_color)
+        row_fills = {
+            menu_label_color: PatternFill(start_color=menu_label_color, fill_type="solid"),
+            female_key_color: PatternFill(start_color=female_key_color, fill_type="solid"),
+        }
+
+        # Light gray, bold header row
+        header_cells = [(header, bold_font, header_fill, None) for header in headers]
+        rows = []
+
+        diff_pairs = getattr(self, 'diff_pairs', None) or {}
+        diff_color = QColor(self.current_theme.get('diff_text', '#FF0000'))
+        # Compared as one packed integer per cell instead of formatting a hex string
+        diff_rgb = diff_color.rgb()
+
+        # (column name, Excel column index) pairs, resolved once instead of per cell
+        col_plan = [(col_name, self.current_columns.index(col_name)) for col_name in self.column_map]
+
+        # Build the rows from the data model in display order; edits are mirrored into
+        # processed_data as they are made, so the table widget is never read back
+        display_data = self.processed_data
+        for data_index, data in enumerate(display_data):
+            if data.get('is_header', False):
+                # Add group header as a merged cell
+                header_text = f"Dialogue Group: {data['main_key']} ({data['item_count']} entries)"
+                rows.append(([(header_text, bold_font, group_header_fill, None)], True))
+
+                # Scene info row under the header
+                scene_info = self._group_scene_info(display_data, data_index)
+                if scene_info:
+                    rows.append(([(scene_info, scene_font, scene_fill, None)], True))
+                continue
+
+            item = data['item']
+
+            # Missing line row
+            if item.get('is_missing_line', False):
+                missing_text = f"[MISSING LINE {item.get('missing_line_number', '?')}]"
+                rows.append(([(missing_text, missing_font, missing_fill, missing_alignment)], True))
+                continue
+
+            # Regular data row
+            row_cells = [None] * len(headers)
+            row_data, tooltip_text, percentage_diff = self._row_display_values(item)
+            key_text = row_data['Key']
+
+            # Determine row background color
+            bg_fill = None
+            if 'MenuLabel' in key_text:
+                bg_fill = row_fills[menu_label_color]
+            elif key_text.endswith('.F'):
+                bg_fill = row_fills[female_key_color]
+
+            # Gender variant differences replace the tooltip of the target text
+            target_diffs = None
+            if key_text.endswith('.F') and key_text[:-2] in diff_pairs:
+                target_diffs = diff_pairs[key_text[:-2]].get('diffs', [])
+
+            edited = item.get('target_text', '') != item.get('original_target_text', item.get('target_text', ''))
+
+            # Prepare to collect notes/additional information
+            row_notes = []
+
+            # Process each column
+            for col_name, excel_col in col_plan:
+                # Matched rows only show the painted info icon, there is no text to export
+                if col_name == 'Info' and item.get('has_document_match', False):
                     continue
 
-                # Regular data row
-                cell_colors = {}
+                cell_tooltip = tooltip_text if col_name != 'Info' else ''
+
+                # Apply text color for diff highlighting
+                font = None
+                text_color = None
+                if col_name == 'Char Info':
+                    text_color = self._char_info_color(percentage_diff)
+                elif col_name == 'Target Text' and target_diffs is not None and self.diff_highlighting_enabled:
+                    if target_diffs:
+                        text_color = diff_color
+                        cell_tooltip = "Different words: " + ", ".join(target_diffs)
+                    else:
+                        cell_tooltip = ""
+                if text_color is not None and text_color.rgb() == diff_rgb:
+                    font = diff_font
 
-                # Get key to determine row type
-                key_col = self.column_map.get('Key', 0)
-                key_item = self.table.item(row, key_col)
-                key_text = key_item.text() if key_item else ""
+                # Bold for edited cells
+                if col_name == 'Target Text' and edited:
+                    font = bold_font
 
-                # Determine row background color
-                bg_color = None
-                if key_item:
-                    if 'MenuLabel' in key_text:
-                        bg_color = menu_label_color
-                    elif key_text.endswith('.F'):
-                        bg_color = female_key_color
+                row_cells[excel_col] = (row_data.get(col_name, ''), font, bg_fill, data_alignment)
 
-                # Prepare to collect notes/additional information
-                row_notes = []
+                # Collect tooltip information
+                if cell_tooltip:
+                    row_notes.append(f"{col_name}: {cell_tooltip}")
 
-                # Process each column
-                for col_name, col_index in self.column_map.items():
-                    cell = self.table.item(row, col_index)
-                    if not cell:
-                        continue
-
-                    excel_col = self.current_columns.index(col_name) + 1  # Excel is 1-indexed
-                    cell_value = cell.text()
-
-                    # Create Excel cell
-                    excel_cell = ws.cell(row=excel_row, column=excel_col, value=cell_value)
-
-                    # Apply basic formatting
-                    excel_cell.alignment = Alignment(wrap_text=True, vertical='top')
-
-                    # Apply background color if needed
-                    if bg_color:
-                        excel_cell.fill = PatternFill(start_color=bg_color, fill_type="solid")
-
-                    # Apply text color for diff highlighting
-                    if cell.foreground().color().name() == QColor(
-                            self.current_theme.get('diff_text', '#FF0000')).name():
-                        excel_cell.font = Font(color=diff_text_color)
-
-                    # Bold for edited cells
-                    if cell.font().bold():
-                        excel_cell.font = Font(bold=True)
-
-                    # Collect tooltip information
-                    tooltip = cell.toolTip()
-                    if tooltip:
-                        row_notes.append(f"{col_name}: {tooltip}")
-
-                # Add collected notes to the last column
-                notes_col = len(headers)
-                ws.cell(row=excel_row, column=notes_col, value='; '.join(row_notes))
-
-                excel_row += 1
-
-            # Auto-adjust column widths
-            for col_idx, col_name in enumerate(headers, 1):
-                # Set column width based on content
-                if col_name in ['Source Text', 'Target Text', 'Additional Notes']:
-                    # Make text columns wider
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 60
-                elif col_name == 'Char Info':
-                    # Make character info column narrower
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 15
-                else:
-                    # Default width for other columns
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 25
+            # Add collected notes to the last column
+            row_cells[-1] = '; '.join(row_notes)
+            rows.append((row_cells, False))
 
-            # Save the workbook
-            wb.save(save_path)
+        return header_cells, column_widths, rows
 
-            # Hide progress bar and show success message
-            self.progress_bar.setVisible(False)
-            self.statusBar.showMessage(f"Excel file exported successfully to {save_path}", 5000)
+    def _on_excel_export_completed(self, result):
+        """Handle a completed Excel export."""
+        # Hide progress bar
+        self.progress_bar.setVisible(False)
 
-            # Show success message
-            QMessageBox.information(
-                self,
-                "Export Successful",
-                f"Excel file was successfully exported to:\n{save_path}\n\n"
-                f"Total rows: {excel_row - 1}\n"
-                f"Formatting and additional information have been preserved in the 'Additional Notes' column."
-            )
+        save_path = result.get('file_path', '')
+        self.statusBar.showMessage(f"Excel file exported successfully to {save_path}", 5000)
 
-        except Exception as e:
-            # Log and show error
-            self.log(f"Excel export error: {str(e)}")
-            import traceback
-            self.log(traceback.format_exc())
+        # Show success message; the header row counts as a row
+        QMessageBox.information(
+            self,
+            "Export Successful",
+            f"Excel file was successfully exported to:\n{save_path}\n\n"
+            f"Total rows: {result.get('row_count', 0) + 1}\n"
+            f"Formatting and additional information have been preserved in the 'Additional Notes' column."
+        )
 
-            self.progress_bar.setVisible(False)
-            self.statusBar.showMessage(f"Error exporting to Excel: {str(e)}", 5000)
+    def _on_excel_export_error(self, error_message):
+        """Handle a failed Excel export from the worker thread."""
+        self.progress_bar.setVisible(False)
+        self.statusBar.showMessage("Error exporting to Excel", 5000)
 
-            QMessageBox.critical(
-                self,
-                "Excel Export Error",
-                f"An error occurred while exporting to Excel:\n\n{str(e)}"
-            )
+        # Log error
+        self.log(f"Excel export error: {error_message}")
+
+        QMessageBox.critical(
+            self,
+            "Excel Export Error",
+            error_message
+        )
 
     def _excel_color_from_qcolor(self, qcolor):
         """Convert a QColor to Excel color string format (RRGGBB)."""
@@ -627,14 +475,8 @@ class MXLIFFParser(QMainWindow):
             # Update status
             self.statusBar.showMessage(f"File exported successfully to {file_path}", 5000)
 
-            # Calculate editing stats
-            edited_count = 0
-            for data in self.processed_data:
-                if not data.get('is_header', True) and 'item' in data:
-                    item = data['item']
-                    if 'target_text' in item and 'original_target_text' in item:
-                        if item['target_text'] != item['original_target_text']:
-                            edited_count += 1
+            # Edited items as counted when the export started
+            edited_count = result.get('edited_count', 0)
 
             # Show success message
             QMessageBox.information(
@@ -652,138 +494,19 @@ class MXLIFFParser(QMainWindow):
                 "Failed to export file. See log for details."
             )
 
-    def upload_document(self):
-        """Handle uploading and processing a Word or PDF document."""
-        # Check if we have MXLIFF data loaded
-        if not hasattr(self, 'processed_data') or not self.processed_data:
-            QMessageBox.warning(
-                self,
-                "No MXLIFF Data",
-                "Please open an MXLIFF file first before uploading a document."
-            )
-            return
-
-        # Initialize document parser for file selection only
-        self.document_parser = DocumentParser(self)
-
-        # Select document file
-        file_path = self.document_parser.select_document()
-        if not file_path:
-            return  # User cancelled
-
-        # Always start document processing in worker thread
-        self._start_document_processing(file_path)
-
-    def _start_document_processing(self, file_path):
-        """Start document processing in a worker thread."""
-        # Show progress bar
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.progress_bar.setRange(0, 100)  # Set to determinate mode
-        self.statusBar.showMessage(f"Processing document: {os.path.basename(file_path)}...")
-
-        # Add cancel button during processing
-        if not hasattr(self, 'cancel_button'):
-            self.cancel_button = QPushButton("Cancel")
-            self.cancel_button.clicked.connect(self.cancel_current_operation)
-            self.statusBar.addPermanentWidget(self.cancel_button)
-        else:
-            self.cancel_button.show()
-
-        # Create worker thread
-        self.worker = FileProcessingWorker(file_path, 'process_document', self)
-
-        # Set data needed for processing
-        self.worker.set_data('processed_data', self.processed_data)
-
-        # Connect signals
-        self.worker.progress_signal.connect(self._update_progress)
-        self.worker.finished_signal.connect(self._on_document_processed)
-        self.worker.error_signal.connect(self._on_worker_error)
-
-        # Start worker
-        self.worker.start()
-
-    def _on_document_processed(self, result):
-        """Handle completed document processing."""
-        # Hide progress bar
+    def _on_export_error(self, error_message):
+        """Handle a failed export from the worker thread."""
         self.progress_bar.setVisible(False)
+        self.statusBar.showMessage("Error exporting file", 5000)
 
-        # Check for success
-        if result.get('success', False):
-            match_results = result.get('match_results', {'matches': 0, 'updates': []})
-
-            # Process updates
-            comment_updates = 0
-            updated_keys = set()  # Just for tracking, not for UI updates
-
-            for update in match_results['updates']:
-                key = update.get('key')
-                comment = update.get('comment')
-
-                # Find the item in processed data
-                for data in self.processed_data:
-                    if not data.get('is_header', True) and 'item' in data:
-                        item = data['item']
-                        if item.get('key') == key:
-                            # Add comment to note_text field
-                            note_text = item.get('note_text', '')
-
-                            # Instead of replacing existing comments, append the new one with "CoT Comment:" prefix
-                            if note_text:
-                                # Add new comment as a new line
-                                note_text += f"\nCoT Comment: {comment}"
-                            else:
-                                # First comment for this item
-                                note_text = f"CoT Comment: {comment}"
-
-                            # Update the note_text
-                            item['note_text'] = note_text
-                            comment_updates += 1
-                            updated_keys.add(key)
-                            break
-
-            # Update the Source Text column with comment icons
-            key_col = self.column_map.get('Key', 0)
-            source_col = self.column_map.get('Source Text', 2)
-
-            for row in range(self.table.rowCount()):
-                key_item = self.table.item(row, key_col)
-                if not key_item:
-                    continue
-
-                key_text = key_item.text()
-
-                # Find if this key has comments
-                for data in self.processed_data:
-                    if not data.get('is_header', True) and 'item' in data:
-                        item = data['item']
-                        if item.get('key') == key_text and has_comments(item):
-                            # Add comment icon to Source Text
-                            source_item = self.table.item(row, source_col)
-                            if source_item and not source_item.text().startswith('💬 '):
-                                source_item.setText('💬 ' + source_item.text().replace('💬 ', ''))
-                            break
-
-            # Show status message
-            self.statusBar.showMessage(
-                f"Document processed: Added {comment_updates} comments from {match_results['matches']} matched entries.",
-                5000
-            )
+        # Log error
+        self.log(f"Export Exception: {error_message}")
 
-            # Show a popup to inform user
-            QMessageBox.information(
-                self,
-                "Document Processing Complete",
-                f"Successfully processed the document:\n\n"
-                f"- Found {len(result.get('tables', []))} tables with conversation data\n"
-                f"- Matched {match_results['matches']} entries with MXLIFF content\n"
-                f"- Updated {comment_updates} entries with comments\n\n"
-                f"Comments will be shown when hovering over entries or included in export."
-            )
-        else:
-            # Error already handled in _on_worker_error
-            pass
+        QMessageBox.critical(
+            self,
+            "Export Error",
+            error_message
+        )
 
     def on_item_selected(self, current, previous):
         """Update tooltip for a selected item if it has comments."""
@@ -791,7 +514,7 @@ class MXLIFFParser(QMainWindow):
             return
 
         row = current.row()
-        key_col = self.column_map.get('Key', 0)
+        key_col = self._key_col
         key_item = self.table.item(row, key_col)
 
         if not key_item:
@@ -800,13 +523,7 @@ class MXLIFFParser(QMainWindow):
         key_text = key_item.text()
 
         # Find the corresponding data item
-        data_item = None
-        for data in self.processed_data:
-            if not data.get('is_header', True) and 'item' in data:
-                item = data['item']
-                if item.get('key', '') == key_text:
-                    data_item = item
-                    break
+        data_item = self._items_by_key.get(key_text)
 
         if data_item and has_comments(data_item):
             # Update tooltip for this row only
@@ -815,11 +532,16 @@ class MXLIFFParser(QMainWindow):
             if comment_text:
                 tooltip_text = f"{comment_text}\n\n{tooltip_text}"
 
-            # Update cells in this row
-            for col in range(self.table.columnCount()):
-                cell = self.table.item(row, col)
-                if cell:
-                    cell.setToolTip(tooltip_text)
+            # Update cells in this row. Only cells whose tooltip differs are touched, and with
+            # signals blocked, so a tooltip refresh does not run on_cell_changed for every column
+            self.table.blockSignals(True)
+            try:
+                for col in range(self.table.columnCount()):
+                    cell = self.table.item(row, col)
+                    if cell and cell.toolTip() != tooltip_text:
+                        cell.setToolTip(tooltip_text)
+            finally:
+                self.table.blockSignals(False)
 
 
 
@@ -916,6 +638,14 @@ class MXLIFFParser(QMainWindow):
         # In your initUI method
         self.table.selectionModel().currentChanged.connect(self.on_item_selected)
 
+        # Rows are refitted to their wrapped text once the column widths settle, e.g. after the
+        # scroll bar appears or the window is resized, instead of on every intermediate resize
+        self._row_fit_timer = QTimer(self)
+        self._row_fit_timer.setSingleShot(True)
+        self._row_fit_timer.setInterval(150)
+        self._row_fit_timer.timeout.connect(self.table.resizeRowsToContents)
+        self.header.sectionResized.connect(lambda *args: self._row_fit_timer.start())
+
         # Set up table columns
         self.setup_table_columns()
 
@@ -1104,12 +834,20 @@ class MXLIFFParser(QMainWindow):
         # Update column map
         self.column_map = {col: idx for idx, col in enumerate(self.current_columns)}
 
+        # Column indices read by the selection, edit and comment handlers, resolved once here
+        self._key_col = self.column_map.get('Key', 0)
+        self._info_col = self.column_map.get('Info', 1)
+        self._source_col = self.column_map.get('Source Text', 2)
+        self._target_col = self.column_map.get('Target Text', 3)
+
+        # Only the columns that show an icon or marker go through the Python delegate
+        for col_name in ('Info', 'Source Text'):
+            if col_name in self.column_map:
+                self.table.setItemDelegateForColumn(self.column_map[col_name], self.cell_delegate)
+
         # Enable text wrapping for all columns
         self.table.setWordWrap(True)
 
-        # Adjust row height to accommodate wrapped text
-        self.table.resizeRowsToContents()
-
     def apply_theme(self):
         """Apply the current theme to all UI elements."""
         stylesheet = ThemeManager.generate_stylesheet(self.current_theme)
@@ -1139,22 +877,8 @@ class MXLIFFParser(QMainWindow):
         if not hasattr(self, 'processed_data') or not self.processed_data:
             return False
 
-        # For each data item, check if the target text differs from the original
-        for data in self.processed_data:
-            if not data.get('is_header', True) and 'item' in data:
-                item = data['item']
-                key = item.get('key', '')
-
-                # Get the item from the table to compare
-                if key:
-                    target_text = item.get('target_text', '')
-                    original_text = item.get('original_target_text', target_text)
-
-                    # If they differ, we have unsaved changes
-                    if target_text != original_text:
-                        return True
-
-        return False
+        # Edited keys are tracked as the cells change
+        return bool(self._dirty_keys)
 
     def open_content_team_info(self):
         """Open Content Team Info link."""
@@ -1216,6 +940,8 @@ class MXLIFFParser(QMainWindow):
             # Clear previous results
             self.table.setRowCount(0)
             self.processed_data = []
+            self._items_by_key = {}
+            self._dirty_keys = set()
             self.diff_pairs = {}
 
             # Parse the file in a separate timer to avoid freezing UI
@@ -1227,15 +953,11 @@ class MXLIFFParser(QMainWindow):
             # Parse the file
             self.log("Starting to parse the file...")
 
-            with codecs.open(file_path, 'r', 'utf-8', errors='ignore') as f:
-                xml_content = f.read()
-
-                # Store the original content and file path
-                self.original_xml_content = xml_content
-                self.current_file_path = file_path
+            # Store the file path; the original content is re-read from disk on export
+            self.current_file_path = file_path
 
-                # Direct XML parsing approach
-                self.parse_xml(xml_content)
+            # Reopening an unchanged file reuses the records of its last parse
+            self.show_parsed_data(XMLParser.parse_xml_file(file_path, self.log))
 
             self.progress_bar.setVisible(False)
 
@@ -1290,23 +1012,16 @@ class MXLIFFParser(QMainWindow):
 
     def export_file(self):
         """Export the updated MXLIFF file with edited translations."""
-        if not self.original_xml_content or not self.current_file_path:
+        if not self.current_file_path:
             QMessageBox.warning(
                 self,
                 "Export Error",
-                "No file is currently loaded or the original content is missing."
+                "No file is currently loaded."
             )
             return
 
         # Check if we have any changes to export
-        has_changes = False
-        for data in self.processed_data:
-            if not data.get('is_header', True) and 'item' in data:
-                item = data['item']
-                if 'target_text' in item and 'original_target_text' in item:
-                    if item['target_text'] != item['original_target_text']:
-                        has_changes = True
-                        break
+        has_changes = bool(self._dirty_keys)
 
         if not has_changes:
             reply = QMessageBox.question(
@@ -1334,12 +1049,8 @@ class MXLIFFParser(QMainWindow):
             return  # User cancelled
 
         try:
-            # Show progress
-            self.progress_bar.setVisible(True)
-            self.statusBar.showMessage("Exporting file...")
-
-            # We'll update the XML in a timer to allow UI to update
-            QTimer.singleShot(100, lambda: self._process_export(save_path))
+            # Write the file on the thread pool so the window stays responsive
+            self._start_export(save_path)
 
         except Exception as e:
             self.progress_bar.setVisible(False)
@@ -1352,62 +1063,6 @@ class MXLIFFParser(QMainWindow):
                 error_msg
             )
 
-    def _process_export(self, save_path):
-        """Process the export after a short delay to allow UI to update."""
-        try:
-            # Show edited translations in log (for debugging)
-            edited_count = 0
-            for data in self.processed_data:
-                if not data.get('is_header', True) and 'item' in data:
-                    item = data['item']
-                    if 'target_text' in item and 'original_target_text' in item:
-                        if item['target_text'] != item['original_target_text']:
-                            edited_count += 1
-                            self.log(f"Edited: Key={item.get('key', 'UNKNOWN')}")
-                            self.log(f"  Original: {item.get('original_target_text', '')}")
-                            self.log(f"  Changed: {item.get('target_text', '')}")
-                            if edited_count <= 5:  # Log only first 5 for brevity
-                                self.log(
-                                    f"Edited key: {item.get('key', '')} - Original: '{item.get('original_target_text', '')}' -> New: '{item.get('target_text', '')}'")
-
-            self.log(f"Total edited translations: {edited_count}")
-
-            # Create an updated XML content with the edited translations
-            self.log("Starting XML update...")
-            updated_xml = XMLParser.update_xml_content(self.original_xml_content, self.processed_data, self.log)
-            self.log("XML update completed")
-
-            # Write to the new file
-            with codecs.open(save_path, 'w', 'utf-8') as f:
-                f.write(updated_xml)
-
-            self.progress_bar.setVisible(False)
-            self.statusBar.showMessage(f"File exported successfully to {save_path}", 5000)
-
-            # Provide a detailed success message
-            QMessageBox.information(
-                self,
-                "Export Successful",
-                f"MXLIFF file was successfully exported to:\n{save_path}\n\n"
-                f"Total translations: {len(self.processed_data) - len(self.group_headers)}\n"
-                f"Edited translations: {edited_count}"
-            )
-
-        except Exception as e:
-            self.progress_bar.setVisible(False)
-            error_msg = f"Error exporting file: {str(e)}"
-            self.statusBar.showMessage(error_msg, 5000)
-
-            # Print full traceback to log
-            self.log(f"Export Exception: {str(e)}")
-            self.log(traceback.format_exc())
-
-            QMessageBox.critical(
-                self,
-                "Export Error",
-                error_msg
-            )
-
     def upload_document(self):
         """Handle uploading and processing a Word or PDF document."""
         # Check if we have MXLIFF data loaded
@@ -1471,60 +1126,56 @@ class MXLIFFParser(QMainWindow):
             for update in match_results['updates']:
                 self.log(f"Key: {update.get('key')}, Comment: {update.get('comment')}")
 
-            # Update MXLIFF data with comments
+            # Group the comments by the keys they apply to; a comment also goes to the
+            # key's .F variant (or, for a .F key, to its base key)
+            comments_by_key = {}
             for update in match_results['updates']:
                 key = update.get('key')
                 comment = update.get('comment')
 
-                # Debug: Try to match even without .F
+                # Find matching keys (including variants)
                 if key.endswith('.F'):
-                    base_key = key[:-2]
+                    matched_keys = [key, key[:-2]]
                 else:
-                    base_key = key
-                    key_variants = [key, f"{key}.F"]
+                    matched_keys = [key, f"{key}.F"]
 
-                # Find matching keys (including variants)
-                matched_keys = [key]
-                if key.endswith('.F'):
-                    matched_keys.append(base_key)
-                elif not key.endswith('.F'):
-                    matched_keys.append(f"{key}.F")
-
-            # Update all matching keys
-            for match_key in matched_keys:
-                # Find the item in processed data
-                for data in self.processed_data:
-                    if not data.get('is_header', True) and 'item' in data:
-                        item = data['item']
-                        if item.get('key') == match_key:
-                            # Add comment to note_text field
-                            note_text = item.get('note_text', '')
-
-                            # Check if there's already a comment
-                            if 'Comment:' in note_text:
-                                # Replace existing comment
-                                note_text = re.sub(
-                                    r'Comment:.*?(?=\n|$)',
-                                    f'Comment: {comment}',
-                                    note_text
-                                )
-                            else:
-                                # Add new comment
-                                if note_text:
-                                    note_text += f"\nComment: {comment}"
-                                else:
-                                    note_text = f"Comment: {comment}"
-
-                            # Update the note_text
-                            item['note_text'] = note_text
-                            item['has_document_match'] = True  # Add this line here
-                            comment_updates += 1
-                            updated_keys.add(match_key)
-                            self.log(f"Updated key: {match_key} with comment")
-                            break
+                for match_key in matched_keys:
+                    comments_by_key.setdefault(match_key, []).append(comment)
+
+            # Update MXLIFF data with comments, one lookup and one note rewrite per key
+            for match_key, comments in comments_by_key.items():
+                item = self._items_by_key.get(match_key)
+                if item is None:
+                    continue
+
+                # Each comment replaces the previous one, so only the last is written
+                comment = comments[-1]
+                note_text = item.get('note_text', '')
+
+                # Check if there's already a comment
+                if 'Comment:' in note_text:
+                    # Replace existing comment
+                    note_text = re.sub(
+                        r'Comment:.*?(?=\n|$)',
+                        f'Comment: {comment}',
+                        note_text
+                    )
+                else:
+                    # Add new comment
+                    if note_text:
+                        note_text += f"\nComment: {comment}"
+                    else:
+                        note_text = f"Comment: {comment}"
+
+                # Update the note_text
+                item['note_text'] = note_text
+                item['has_document_match'] = True
+                comment_updates += len(comments)
+                updated_keys.add(match_key)
+                self.log(f"Updated key: {match_key} with comment")
 
             # Get the Info column index for verification
-            info_col = self.column_map.get('Info', 1)
+            info_col = self._info_col
             if info_col >= 0:
                 self.log(f"Info column found at index {info_col}, will update with icons")
             else:
@@ -1585,69 +1236,54 @@ class MXLIFFParser(QMainWindow):
             return
 
         # Columns we care about
-        key_col = self.column_map.get('Key', 0)
-        info_col = self.column_map.get('Info', 1)  # Get the Info column index
-        source_col = self.column_map.get('Source Text', 2)  # Adjust index if needed due to new Info column
+        key_col = self._key_col
+        info_col = self._info_col  # Get the Info column index
+        source_col = self._source_col  # Adjust index if needed due to new Info column
 
-        # Iterate through table rows
-        for row in range(self.table.rowCount()):
-            key_item = self.table.item(row, key_col)
-            if not key_item:
-                continue
+        items_by_key = self._items_by_key
 
-            key_text = key_item.text()
+        # Batch the cell updates into a single repaint
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            for row, key_text in self._rows_with_keys(key_col, updated_keys):
+                item = items_by_key.get(key_text)
+                if item is None:
+                    continue
 
-            # Check if this key is in the updated keys
-            if key_text in updated_keys:
-                # Find the corresponding data item in processed_data
-                matching_data = next(
-                    (data for data in self.processed_data
-                     if not data.get('is_header', False)
-                     and data.get('item', {}).get('key') == key_text),
-                    None
-                )
+                # Prepare tooltip with note text and comments
+                note_text = item.get('note_text', '')
+                has_comment = has_comments(item)
+                comment_text = get_comment_text(item) if has_comment else ''
 
-                if matching_data:
-                    item = matching_data['item']
+                tooltip_text = note_text
+                if comment_text:
+                    tooltip_text = f"{comment_text}\n\n{note_text}"
 
-                    # Prepare tooltip with note text and comments
-                    note_text = item.get('note_text', '')
-                    comment_text = get_comment_text(item) if has_comments(item) else ''
+                # Update tooltip for all cells in this row
+                for col in range(self.table.columnCount()):
+                    if col != info_col:  # Skip info column as we'll handle it separately
+                        cell = self.table.item(row, col)
+                        if cell and cell.toolTip() != tooltip_text:
+                            cell.setToolTip(tooltip_text)
 
-                    tooltip_text = note_text
-                    if comment_text:
-                        tooltip_text = f"{comment_text}\n\n{note_text}"
+                # Update the Info column with info icon
+                if info_col >= 0:
+                    # Create and set the info icon with tooltip
+                    self.create_info_icon(row, info_col, tooltip_text)
 
-                    # Update tooltip for all cells in this row
-                    for col in range(self.table.columnCount()):
-                        if col != info_col:  # Skip info column as we'll handle it separately
-                            cell = self.table.item(row, col)
-                            if cell:
-                                cell.setToolTip(tooltip_text)
-
-                    # Update the Info column with info icon
-                    if info_col >= 0:
-                        # Remove any existing cell widget
-                        existing_widget = self.table.cellWidget(row, info_col)
-                        if existing_widget:
-                            self.table.removeCellWidget(row, info_col)
-
-                        # Create and set the info icon with tooltip
-                        self.create_info_icon(row, info_col, tooltip_text)
-
-                        # Log that we've added an icon (for debugging)
-                        self.log(f"Added info icon for key: {key_text}")
-
-                    # Update the source text column with comment icon if needed
-                    if source_col >= 0:
-                        source_item = self.table.item(row, source_col)
-                        if source_item:
-                            current_text = source_item.text()
-                            if has_comments(item) and not current_text.startswith('💬 '):
-                                source_item.setText("💬 " + current_text.replace('💬 ', ''))
-                            elif not has_comments(item) and current_text.startswith('💬 '):
-                                # Remove icon if comment was removed
-                                source_item.setText(current_text.replace('💬 ', ''))
+                    # Log that we've added an icon (for debugging)
+                    self.log(f"Added info icon for key: {key_text}")
+
+                # Update the source text column with comment icon if needed
+                if source_col >= 0:
+                    source_item = self.table.item(row, source_col)
+                    if source_item:
+                        # The delegate draws the marker; the cell text stays the plain source
+                        source_item.setData(HAS_COMMENT_ROLE, has_comment)
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
 
     def check_missing_lines(self):
         """
@@ -1767,8 +1403,8 @@ class MXLIFFParser(QMainWindow):
         if not self.diff_highlighting_enabled or not self.diff_pairs:
             return
 
-        target_col = self.column_map.get('Target Text', 3)
-        key_col = self.column_map.get('Key', 0)
+        target_col = self._target_col
+        key_col = self._key_col
 
         # Process all rows in the table
         for row in range(self.table.rowCount()):
@@ -1807,7 +1443,7 @@ class MXLIFFParser(QMainWindow):
 
     def find_row_by_key(self, key):
         """Find a row in the table by key."""
-        key_col = self.column_map.get('Key', 0)
+        key_col = self._key_col
         for row in range(self.table.rowCount()):
             item = self.table.item(row, key_col)
             if item and item.text() == key:
@@ -1827,8 +1463,8 @@ class MXLIFFParser(QMainWindow):
                 return
 
             # Check if it's a target text cell with differences
-            if column == self.column_map.get('Target Text', 3):
-                key_col = self.column_map.get('Key', 0)
+            if column == self._target_col:
+                key_col = self._key_col
                 key_item = self.table.item(row, key_col)
 
                 if key_item and key_item.text().endswith('.F'):
@@ -1842,8 +1478,8 @@ class MXLIFFParser(QMainWindow):
 
     def show_diff_dialog(self, row):
         """Show a dialog with highlighting of differences."""
-        key_col = self.column_map.get('Key', 0)
-        target_col = self.column_map.get('Target Text', 3)
+        key_col = self._key_col
+        target_col = self._target_col
 
         key_item = self.table.item(row, key_col)
         target_item = self.table.item(row, target_col)
@@ -1895,7 +1531,7 @@ class MXLIFFParser(QMainWindow):
 
         try:
             # Make sure it's the Target Text column
-            target_col = self.column_map.get('Target Text', 3)
+            target_col = self._target_col
             if column != target_col:
                 self.updating_cell = False
                 return
@@ -1910,7 +1546,7 @@ class MXLIFFParser(QMainWindow):
             new_text = item.text()
 
             # Get the key for this row
-            key_col = self.column_map.get('Key', 0)
+            key_col = self._key_col
             key_item = self.table.item(row, key_col)
             if not key_item:
                 self.updating_cell = False
@@ -1933,21 +1569,24 @@ class MXLIFFParser(QMainWindow):
             updated = False
             has_comment = False
 
-            for data in self.processed_data:
-                if not data.get('is_header', True) and 'item' in data:
-                    item_data = data['item']
-                    if item_data.get('key', '') == key_text:
-                        # Check if it has comments before we change it
-                        has_comment = has_comments(item_data)
+            item_data = self._items_by_key.get(key_text)
+            if item_data is not None:
+                # Check if it has comments before we change it
+                has_comment = has_comments(item_data)
 
-                        # Store original if not already stored
-                        if 'original_target_text' not in item_data:
-                            item_data['original_target_text'] = item_data.get('target_text', '')
+                # Store original if not already stored
+                if 'original_target_text' not in item_data:
+                    item_data['original_target_text'] = item_data.get('target_text', '')
 
-                        # Update the text
-                        item_data['target_text'] = new_text
-                        updated = True
-                        break
+                # Update the text
+                item_data['target_text'] = new_text
+                updated = True
+
+                # Track the key as edited until it is reverted
+                if new_text != item_data['original_target_text']:
+                    self._dirty_keys.add(key_text)
+                else:
+                    self._dirty_keys.discard(key_text)
 
             if updated:
                 # Store the new text for comparison later
@@ -1958,11 +1597,14 @@ class MXLIFFParser(QMainWindow):
                 font.setBold(True)
                 item.setFont(font)
 
+                # Fit the edited row to its new text; rows are otherwise only measured on load
+                self.table.resizeRowToContents(row)
+
                 # Update the Char Info column
                 char_info_col = self.column_map.get('Char Info', 4)
                 if char_info_col >= 0:
                     # Get source text
-                    source_col = self.column_map.get('Source Text', 2)
+                    source_col = self._source_col
                     source_item = self.table.item(row, source_col)
                     if not source_item:
                         return
@@ -2003,13 +1645,11 @@ class MXLIFFParser(QMainWindow):
                             char_item.setForeground(QColor(self.current_theme['text_primary']))
 
                     # Update the Source Text column with comment icon if needed
-                    source_col = self.column_map.get('Source Text', 2)
+                    source_col = self._source_col
                     if source_col >= 0 and has_comment:
                         source_item = self.table.item(row, source_col)
                         if source_item:
-                            current_text = source_item.text()
-                            if not current_text.startswith('💬 '):
-                                source_item.setText("💬 " + current_text.replace('💬 ', ''))
+                            source_item.setData(HAS_COMMENT_ROLE, True)
 
                 # Check if this is a female variant (.F)
                 if key_text.endswith('.F'):
@@ -2101,8 +1741,8 @@ class MXLIFFParser(QMainWindow):
             text (str, optional): Text to analyze. If None, will extract from the table item.
         """
         # Ensure we're working with the Target Text column
-        target_col = self.column_map.get('Target Text', 3)
-        source_col = self.column_map.get('Source Text', 2)
+        target_col = self._target_col
+        source_col = self._source_col
 
         # Safety checks
         if (row < 0 or row >= self.table.rowCount() or
@@ -2120,13 +1760,9 @@ class MXLIFFParser(QMainWindow):
         if text is None:
             text = target_item.text()
 
-        # Get source text
+        # Get source text; the comment marker is painted, not part of the text
         source_text = source_item.text().strip()
 
-        # Remove comment icon from source text if present
-        if source_text.startswith('💬 '):
-            source_text = source_text[2:].strip()
-
         # Count characters
         source_char_count = len(source_text)
         target_char_count = len(text)
@@ -2165,13 +1801,8 @@ class MXLIFFParser(QMainWindow):
 
         return info_text
 
-    def parse_xml(self, xml_content):
-        """Parse XML directly using regex approach for MXLIFF files."""
-        self.log("Parsing XML using direct regex approach...")
-
-        # Use the parser utility to process the XML content
-        processed_data = XMLParser.parse_xml(xml_content, self.log)
-
+    def show_parsed_data(self, processed_data):
+        """Group parsed records by main key, mark missing lines and display them."""
         # Group by main key
         grouped_data = {}
         for item in processed_data:
@@ -2243,12 +1874,144 @@ class MXLIFFParser(QMainWindow):
 
         # Store the processed data for reuse when column order changes
         self.processed_data = display_data
+        self._index_processed_data()
 
         # Display in table
         self.display_results(display_data)
 
+    def _row_display_values(self, item):
+        """
+        Build the per-column texts of a data row as the table shows them.
+
+        Returns:
+            tuple: (row_data dict keyed by column name, tooltip text, char count percentage difference)
+        """
+        # Combine Speaker Target and Speaker Gender
+        speaker_info = []
+
+        # Check for female key ending
+        is_female_key = item.get('key', '') and str(item.get('key', '')).endswith('.F')
+
+        # Add Speaker Target
+        speaker_target = item.get('speaker_target', '')
+        if speaker_target:
+            speaker_info.append(f"Speaker Target: {speaker_target}")
+        elif is_female_key and not speaker_target:
+            speaker_info.append("Speaker Target: Player - Female")
+        else:
+            speaker_info.append("Speaker Target: None")
+
+        # Add Speaker Gender
+        speaker_gender = item.get('speaker_gender', '')
+        if speaker_gender and speaker_gender.lower() != 'none':
+            speaker_info.append(f"Speaker Gender: {speaker_gender}")
+        else:
+            speaker_info.append("Speaker Gender: None")
+
+        # Combine Player Class and Player Gender
+        player_info = []
+
+        # Add Player Class
+        player_class = item.get('player_class', '')
+        if player_class and player_class.lower() not in ('- none -', 'none', '-none-'):
+            player_info.append(f"Class: {player_class}")
+        else:
+            player_info.append("Class: - None -")
+
+        # Add Player Gender
+        player_gender = item.get('player_gender', '')
+
+        if player_gender and player_gender.lower() != 'none':
+            player_info.append(f"Gender: {player_gender}")
+        elif is_female_key:
+            player_info.append("Gender: Female")
+        else:
+            player_info.append("Gender: None")
+
+        # Check if this item has comments that should be highlighted
+        has_comment = has_comments(item)
+        comment_text = get_comment_text(item) if has_comment else ""
+
+        # Build source text with comment icon if needed (the table paints it from HAS_COMMENT_ROLE instead)
+        source_text = item.get('source_text', '')
+        if has_comment and not source_text.startswith('💬 '):
+            source_text = f"💬 {source_text}"
+
+        # Prepare tooltip text
+        tooltip_text = item.get('note_text', '')
+        if has_comment:
+            tooltip_text = f"{comment_text}\n\n{tooltip_text}" if tooltip_text else comment_text
+
+        # Calculate character info from the raw source and target texts
+        source_char_count = len(item.get('source_text', ''))
+        target_char_count = len(item.get('target_text', ''))
+
+        # Calculate percentage difference
+        percentage_diff = 0
+        if source_char_count > 0:
+            percentage_diff = ((target_char_count - source_char_count) / source_char_count) * 100
+
+        # Prepare char info text
+        if source_char_count == target_char_count:
+            char_info = "Equal"
+        else:
+            if percentage_diff > 0:
+                char_info = f"+{int(percentage_diff)}%"
+            else:
+                char_info = f"{int(percentage_diff)}%"
+
+        row_data = {
+            'Key': item.get('key', ''),
+            'Info': '',  # Holds the info icon, not text
+            'Speaker': item.get('speaker', ''),
+            'Source Text': source_text,
+            'Target Text': item.get('target_text', ''),
+            'Char Info': char_info,
+            'Speaker and Target': '\n'.join(speaker_info),
+            'Player Info': '\n'.join(player_info)
+        }
+
+        return row_data, tooltip_text, percentage_diff
+
+    def _char_info_color(self, percentage_diff):
+        """Text color of a Char Info cell, or None to keep the default."""
+        if abs(percentage_diff) > 20:
+            return QColor(255, 0, 0)
+        elif percentage_diff > 0:
+            return QColor(0, 128, 0)  # Green for positive expansions
+        elif percentage_diff < 0:
+            return QColor(0, 0, 255)  # Blue for contractions
+        return None
+
+    def _group_scene_info(self, display_data, header_index):
+        """Scene line shown under a group header, taken from the group's first item."""
+        if header_index + 1 < len(display_data) and not display_data[header_index + 1].get('is_header', False):
+            first_item = display_data[header_index + 1].get('item', {})
+            note_text = first_item.get('note_text', '')
+            scene_match = re.search(r'Scene:\s*([^\n]+)', note_text)
+            if scene_match:
+                return f"Scene: {scene_match.group(1).strip()}"
+        return ""
+
     def display_results(self, display_data):
         """Display the parsed data in the table."""
+        # Suspend repaints, sorting and signals for the bulk rebuild
+        self.table.setUpdatesEnabled(False)
+        sorting_enabled = self.table.isSortingEnabled()
+        self.table.setSortingEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self._fill_table(display_data)
+        finally:
+            self.table.blockSignals(False)
+            self.table.setSortingEnabled(sorting_enabled)
+            self.table.setUpdatesEnabled(True)
+
+        # Fit the rows to their wrapped text in a single pass once the new rows are laid out
+        self._row_fit_timer.start()
+
+    def _fill_table(self, display_data):
+        """Rebuild the table rows from display_data."""
         # First compare translations to find differences
         display_data = self.compare_translations(display_data)
 
@@ -2360,13 +2123,7 @@ class MXLIFFParser(QMainWindow):
                 row_index += 1
 
                 # Check if there's scene info in the first item of this group
-                scene_info = ""
-                if data_index + 1 < len(display_data) and not display_data[data_index + 1].get('is_header', False):
-                    first_item = display_data[data_index + 1].get('item', {})
-                    note_text = first_item.get('note_text', '')
-                    scene_match = re.search(r'Scene:\s*([^\n]+)', note_text)
-                    if scene_match:
-                        scene_info = f"Scene: {scene_match.group(1).strip()}"
+                scene_info = self._group_scene_info(display_data, data_index)
 
                 # Add scene info in a separate row if available
                 if scene_info:
@@ -2437,112 +2194,21 @@ class MXLIFFParser(QMainWindow):
                     row_index += 1
                     continue
 
-                # Prepare data for each column based on current column layout
-                # Combine Speaker Target and Speaker Gender
-                speaker_info = []
-
-                # Check for female key ending
-                is_female_key = item.get('key', '') and str(item.get('key', '')).endswith('.F')
-
-                # Add Speaker Target
-                speaker_target = item.get('speaker_target', '')
-                if speaker_target:
-                    speaker_info.append(f"Speaker Target: {speaker_target}")
-                elif is_female_key and not speaker_target:
-                    speaker_info.append("Speaker Target: Player - Female")
-                else:
-                    speaker_info.append("Speaker Target: None")
-
-                # Add Speaker Gender
-                speaker_gender = item.get('speaker_gender', '')
-                if speaker_gender and speaker_gender.lower() != 'none':
-                    speaker_info.append(f"Speaker Gender: {speaker_gender}")
-                else:
-                    speaker_info.append("Speaker Gender: None")
-
-                # Combine Player Class and Player Gender
-                player_info = []
-
-                # Add Player Class
-                player_class = item.get('player_class', '')
-                if player_class and player_class.lower() not in ('- none -', 'none', '-none-'):
-                    player_info.append(f"Class: {player_class}")
-                else:
-                    player_info.append("Class: - None -")
-
-                # Add Player Gender
-                player_gender = item.get('player_gender', '')
-
-                if player_gender and player_gender.lower() != 'none':
-                    player_info.append(f"Gender: {player_gender}")
-                elif is_female_key:
-                    player_info.append("Gender: Female")
-                else:
-                    player_info.append("Gender: None")
-
-                # Check if this item has comments that should be highlighted
-                has_comment = has_comments(item)
-                comment_text = get_comment_text(item) if has_comment else ""
-
-                # Build source text with comment icon if needed
-                source_text = item.get('source_text', '')
-                if has_comment and not source_text.startswith('💬 '):
-                    source_text = f"💬 {source_text}"
-
-                # Prepare tooltip text
-                tooltip_text = item.get('note_text', '')
-                if has_comment:
-                    tooltip_text = f"{comment_text}\n\n{tooltip_text}" if tooltip_text else comment_text
-
-                # Inside the display_results method, modify the part that creates row data:
-                row_data = {
-                    'Key': item.get('key', ''),
-                    'Info': '',  # Placeholder for Info column, we'll handle it separately
-                    'Speaker': item.get('speaker', ''),
-                    'Source Text': source_text,
-                    'Target Text': item.get('target_text', ''),
-                    'Char Info': '',  # We'll set this separately
-                    'Speaker and Target': '\n'.join(speaker_info),
-                    'Player Info': '\n'.join(player_info)
-                }
+                row_data, tooltip_text, percentage_diff = self._row_display_values(item)
 
                 # Add data to table according to current column order
                 for col_name, col_index in self.column_map.items():
                     if col_name == 'Char Info':
-                        # Calculate character info for the Char Info column
-                        target_text = item.get('target_text', '')
-                        source_text = item.get('source_text', '')
-
-                        source_char_count = len(source_text)
-                        target_char_count = len(target_text)
-
-                        # Calculate percentage difference
-                        percentage_diff = 0
-                        if source_char_count > 0:
-                            percentage_diff = ((target_char_count - source_char_count) / source_char_count) * 100
-
-                        # Prepare char info text
-                        if source_char_count == target_char_count:
-                            char_info = "Equal"
-                        else:
-                            if percentage_diff > 0:
-                                char_info = f"+{int(percentage_diff)}%"
-                            else:
-                                char_info = f"{int(percentage_diff)}%"
-
                         # Create table item with char info
-                        table_item = QTableWidgetItem(char_info)
+                        table_item = QTableWidgetItem(row_data['Char Info'])
 
                         # Make it non-editable
                         table_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
 
                         # Color code if needed
-                        if abs(percentage_diff) > 20:
-                            table_item.setForeground(QColor(255, 0, 0))
-                        elif percentage_diff > 0:
-                            table_item.setForeground(QColor(0, 128, 0))  # Green for positive expansions
-                        elif percentage_diff < 0:
-                            table_item.setForeground(QColor(0, 0, 255))  # Blue for contractions
+                        char_color = self._char_info_color(percentage_diff)
+                        if char_color is not None:
+                            table_item.setForeground(char_color)
 
                     elif col_name == 'Info':
                         # Only show info icons when a document has been uploaded and matches found
@@ -2558,9 +2224,15 @@ class MXLIFFParser(QMainWindow):
                     else:
                         # Regular column processing
                         value = row_data.get(col_name, '')
+                        if col_name == 'Source Text':
+                            # The comment marker is painted by the delegate from HAS_COMMENT_ROLE
+                            value = item.get('source_text', '')
                         table_item = QTableWidgetItem(value)
 
-                        if col_name == 'Target Text':
+                        if col_name == 'Source Text':
+                            table_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+                            table_item.setData(HAS_COMMENT_ROLE, has_comments(item))
+                        elif col_name == 'Target Text':
                             # Make Target Text column editable
                             table_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable)
                             table_item.setData(Qt.UserRole, item.get('target_text', ''))
@@ -2591,7 +2263,7 @@ class MXLIFFParser(QMainWindow):
                 # Add tooltip with full note text and highlight comment if present
                 if tooltip_text:
                     for col in range(self.table.columnCount()):
-                        if col != self.column_map.get('Info', 1):  # Skip Info column as it already has tooltip
+                        if col != self._info_col:  # Skip Info column as it already has tooltip
                             if self.table.item(row_index, col):
                                 self.table.item(row_index, col).setToolTip(tooltip_text)
 
@@ -2632,7 +2304,7 @@ class MXLIFFParser(QMainWindow):
             if last_row < 0:
                 last_row = self.table.rowCount() - 1
 
-            target_col = self.column_map.get('Target Text', 3)
+            target_col = self._target_col
 
             # Paint word count info below each target text cell for ALL editable cells
             for row in range(first_row, last_row + 1):
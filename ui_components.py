@@ -5,7 +5,7 @@ from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QPainter, QPolygon, QColor
 from PyQt5.QtCore import QPoint  # QPoint is often in QtCore instead of QtGui
 
-from ui.custom_widgets import DraggableHeaderView
+from ui.custom_widgets import DraggableHeaderView, TableCellDelegate
 
 
 class UIComponents:
@@ -236,6 +236,10 @@ class UIComponents:
         table.setHorizontalHeader(header)
         self.parent.header = header
 
+        # Info icons and comment markers are painted by a delegate, not stored as widgets or text;
+        # setup_table_columns installs it on the columns that show them
+        self.parent.cell_delegate = TableCellDelegate(self.parent._info_pixmap(), table)
+
         # Configure table properties
         table.setShowGrid(True)
         table.setAlternatingRowColors(True)
@@ -254,8 +258,9 @@ class UIComponents:
         # Enable text wrapping
         table.setWordWrap(True)
 
-        # Allow rows to resize based on content
-        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        # Rows are fitted to their content by the window once column widths settle and when
+        # edited, instead of re-measuring every row on each layout change
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Interactive)
 
         # Hide vertical header (row numbers)
         table.verticalHeader().setVisible(False)
@@ -1,5 +1,6 @@
 import re
 import difflib
+from functools import lru_cache
 
 def extract_main_key(full_key):
     """Extract the main part of the key (before slash or last period)."""
@@ -63,6 +64,12 @@ def get_comment_text(item):
     if not note_text:
         return ""
 
+    return _comment_from_note(note_text)
+
+
+@lru_cache(maxsize=8192)
+def _comment_from_note(note_text):
+    """Comment line of a note text; cached on the text, so an edited note is simply a new entry."""
     # Extract only regular Comment (added during document matching)
     comment_match = re.search(r'Comment:(.+?)(?=\n|$)', note_text, re.DOTALL)
     if comment_match:
@@ -1,170 +1,393 @@
+import codecs
+import io
+import mmap
+import os
 import re
+import threading
 import traceback
+from collections import OrderedDict
 from utils.utils import extract_order_value
 
+# A whole <group> element, matched on the raw bytes. Each group's markup is decoded and
+# handed to the regex extraction as written, so inline tags and entities stay byte-exact;
+# serializing a parsed tree would add namespace declarations and re-escape the text.
+GROUP_PATTERN = re.compile(rb'<group[^>]*>.*?</group>', re.DOTALL)
+_GROUP_OPEN = b'<group'
+_GROUP_CLOSE = b'</group>'
+
+# Bytes read from disk per scanner feed
+READ_CHUNK_SIZE = 1 << 20
+
+# Characters encoded and written per chunk on export
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Recently parsed files keyed by (path, mtime_ns, size), so reopening an unchanged file is instant
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_SIZE = 4
+_parse_cache_lock = threading.Lock()
+
+
+def _source_size(f):
+    """Total size in bytes of a file object, mmap or in-memory buffer (0 if unknown)."""
+    if isinstance(f, (mmap.mmap, bytes, bytearray)):
+        return len(f)
+    if isinstance(f, io.BytesIO):
+        return f.getbuffer().nbytes
+    try:
+        return os.fstat(f.fileno()).st_size
+    except (AttributeError, OSError):
+        return 0
+
+
+def _decode_utf8(data):
+    """Decode a raw UTF-8 buffer (bytes, memoryview or mmap), dropping invalid sequences."""
+    # str() decodes straight from the buffer protocol, so an mmap is never copied to bytes first
+    return str(data, 'utf-8', 'ignore')
+
+
+def _read_utf8_file(path):
+    """Read and decode a UTF-8 file through a read-only memory map."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _decode_utf8(mm)
+
+
+def _iter_groups(f, chunk_size=None):
+    """Yield (group markup, bytes consumed) for each <group> as soon as it has been read.
+
+    Buffers (mmap, bytes) are scanned in place. File objects are read in
+    chunk_size pieces; the scan only runs again once a chunk brings a closing
+    tag, and bytes that cannot start a group are dropped, so memory stays
+    bounded by the largest group plus one chunk.
+    """
+    if isinstance(f, (mmap.mmap, bytes, bytearray, memoryview)):
+        for match in GROUP_PATTERN.finditer(f):
+            yield _decode_utf8(match.group()), match.end()
+        return
+
+    pending = bytearray()
+    bytes_read = 0
+    while True:
+        chunk = f.read(chunk_size or READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+        bytes_read += len(chunk)
+
+        # Every group still to be matched ends in a closing tag that overlaps the new
+        # chunk, so a long unfinished group is not rescanned until that tag arrives
+        if pending.find(_GROUP_CLOSE, max(0, len(pending) - len(chunk) - len(_GROUP_CLOSE) + 1)) >= 0:
+            # A group whose closing tag has not arrived yet is never matched, and neither
+            # is any group opening after it, so matches here are the same as on the whole file
+            consumed = 0
+            for match in GROUP_PATTERN.finditer(pending):
+                yield _decode_utf8(match.group()), bytes_read
+                consumed = match.end()
+            del pending[:consumed]
+
+        # Without an opening tag, only a tag split at the end of the chunk can start a group
+        if pending.find(_GROUP_OPEN) < 0:
+            del pending[:-(len(_GROUP_OPEN) - 1)]
+
 
 class XMLParser:
     """Handles parsing and exporting MXLIFF XML files."""
 
     @staticmethod
-    def parse_xml(xml_content, logger=None):
-        """Parse XML directly using regex approach for MXLIFF files."""
-        if logger:
-            logger("Parsing XML using direct regex approach...")
+    def parse_xml_stream(source, logger=None, progress_callback=None):
+        """
+        Parse an MXLIFF file incrementally, one <group> at a time.
 
-        # First, find all group elements to properly associate context with trans-units
-        group_pattern = r'<group[^>]*>.*?</group>'
-        groups = re.findall(group_pattern, xml_content, re.DOTALL)
+        Groups are processed as soon as their closing tag has been read, so a
+        file is never decoded or held in memory as a whole.
 
+        Args:
+            source: Path, binary file object, mmap or bytes of the MXLIFF file
+            logger: Optional logging callable
+            progress_callback: Optional callable receiving (bytes_read, total_bytes)
+
+        Returns:
+            list: One record per trans-unit (see _build_record)
+        """
         if logger:
-            logger(f"Found {len(groups)} group elements in the file")
-
-        # Process all groups and their trans-units
-        processed_data = []
-
-        for group_idx, group in enumerate(groups):
-            try:
-                # Extract group ID
-                group_id_match = re.search(r'<group\s+id="([^"]*)"', group)
-                group_id = group_id_match.group(1) if group_id_match else f"group_{group_idx}"
-
-                # Extract context-group for this group (if any)
-                context_group_pattern = r'<context-group[^>]*>(.*?)</context-group>'
-                context_group_match = re.search(context_group_pattern, group, re.DOTALL)
-
-                # Default context information for this group
-                group_key = ""
-                group_note_text = ""
-
-                if context_group_match:
-                    context_group_content = context_group_match.group(1)
-
-                    # Extract key
-                    key_pattern = r'<context\s+context-type="x-key"[^>]*>(.*?)</context>'
-                    key_match = re.search(key_pattern, context_group_content, re.DOTALL)
-                    if key_match:
-                        group_key = key_match.group(1).strip()
-
-                    # Extract notes
-                    note_pattern = r'<context\s+context-type="x-key-note"[^>]*>(.*?)</context>'
-                    note_match = re.search(note_pattern, context_group_content, re.DOTALL)
-                    if note_match:
-                        group_note_text = note_match.group(1).strip()
-
-                # Find all trans-units within this group
-                trans_unit_pattern = r'<trans-unit[^>]*>.*?</trans-unit>'
-                trans_units = re.findall(trans_unit_pattern, group, re.DOTALL)
-
-                if logger:
-                    logger(f"Group {group_id} contains {len(trans_units)} trans-units")
-
-                # Process trans-units in this group
-                for trans_idx, trans_unit in enumerate(trans_units):
-                    # Extract source and target
-                    source_pattern = r'<source[^>]*>(.*?)</source>'
-                    target_pattern = r'<target[^>]*>(.*?)</target>'
-
-                    source_match = re.search(source_pattern, trans_unit, re.DOTALL)
-                    target_match = re.search(target_pattern, trans_unit, re.DOTALL)
-
-                    source_text = source_match.group(1).strip() if source_match else ""
-                    target_text = target_match.group(1).strip() if target_match else ""
-
-                    # Extract trans-unit ID for better tracking
-                    trans_id_match = re.search(r'<trans-unit\s+id="([^"]*)"', trans_unit)
-                    trans_id = trans_id_match.group(1) if trans_id_match else f"trans_{trans_idx}"
-
-                    # Check if this trans-unit has its own context information
-                    unit_context_group_match = re.search(context_group_pattern, trans_unit, re.DOTALL)
-
-                    # Variables to store context information for this specific trans-unit
-                    unit_key = group_key
-                    unit_note_text = group_note_text
-
-                    if unit_context_group_match:
-                        # This trans-unit has its own context group, override the group-level context
-                        unit_context_content = unit_context_group_match.group(1)
-
-                        # Extract key
-                        unit_key_match = re.search(key_pattern, unit_context_content, re.DOTALL)
-                        if unit_key_match:
-                            unit_key = unit_key_match.group(1).strip()
-
-                        # Extract notes
-                        unit_note_match = re.search(note_pattern, unit_context_content, re.DOTALL)
-                        if unit_note_match:
-                            unit_note_text = unit_note_match.group(1).strip()
-
-                    # Extract metadata from note text
-                    speaker = ""
-                    speaker_target = ""
-                    speaker_gender = ""
-                    player_class = ""
-                    player_gender = ""
-                    order_value = 9999
-
-                    if unit_note_text:
-                        # Extract speaker information
-                        speaker_match = re.search(r'Speaker:\s*([^\n]+)', unit_note_text)
-                        speaker_target_match = re.search(r'Target:\s*([^\n]+)', unit_note_text)
-                        speaker_gender_match = re.search(r'Speaker Gender:\s*([^\n]+)', unit_note_text)
-                        player_class_match = re.search(r'Class:\s*([^\n]+)', unit_note_text)
-                        player_gender_match = re.search(r'Player Gender:\s*([^\n]+)', unit_note_text)
-
-                        if speaker_match:
-                            speaker = speaker_match.group(1).strip()
-                        if speaker_target_match:
-                            speaker_target = speaker_target_match.group(1).strip()
-                        if speaker_gender_match:
-                            speaker_gender = speaker_gender_match.group(1).strip()
-                        if player_class_match:
-                            player_class = player_class_match.group(1).strip()
-                        if player_gender_match:
-                            player_gender = player_gender_match.group(1).strip()
-
-                        # Additional specific patterns to ensure we capture the gender info
-                        if not speaker_gender:
-                            gender_match = re.search(r'Gender:\s*([^,\n]+)', unit_note_text)
-                            if gender_match:
-                                speaker_gender = gender_match.group(1).strip()
-
-                        # Look for "speaking to:" pattern which might indicate player gender
-                        speaking_to_match = re.search(r'speaking to:\s*([^,\n]+)', unit_note_text)
-                        if speaking_to_match and not speaker_target:
-                            speaker_target = speaking_to_match.group(1).strip()
-
-                        # Extract order value
-                        order_value = extract_order_value(unit_note_text)
-
-                    # Create a record
-                    processed_data.append({
-                        'index': len(processed_data),
-                        'group_id': group_id,
-                        'trans_id': trans_id,
-                        'source_text': source_text,
-                        'target_text': target_text,
-                        'original_target_text': target_text,  # Store original for change detection
-                        'key': unit_key,
-                        'speaker': speaker,
-                        'speaker_target': speaker_target,
-                        'speaker_gender': speaker_gender,
-                        'player_class': player_class,
-                        'player_gender': player_gender,
-                        'order_value': order_value,
-                        'note_text': unit_note_text,
-                        'is_menulabel': 'MenuLabel' in unit_key  # Flag for MenuLabel entries
-                    })
-
-            except Exception as e:
-                if logger:
-                    logger(f"Error processing group {group_idx}: {str(e)}")
-                    logger(traceback.format_exc())
+            logger("Parsing XML group by group...")
+
+        own_file = isinstance(source, (str, os.PathLike))
+        f = open(source, 'rb') if own_file else source
+        try:
+            total_bytes = _source_size(f)
+            processed_data = []
+            group_idx = 0
+
+            for group, bytes_done in _iter_groups(f):
+                try:
+                    XMLParser._process_group(group, group_idx, processed_data, logger)
+                except Exception as e:
+                    if logger:
+                        logger(f"Error processing group {group_idx}: {str(e)}")
+                        logger(traceback.format_exc())
+                group_idx += 1
+
+                if progress_callback:
+                    progress_callback(bytes_done, total_bytes)
+        finally:
+            if own_file:
+                f.close()
 
         if logger:
+            logger(f"Found {group_idx} group elements in the file")
             logger(f"Total processed items: {len(processed_data)}")
 
         return processed_data
 
+    @staticmethod
+    def parse_xml_file(file_path, logger=None, progress_callback=None):
+        """
+        Parse an MXLIFF file from disk, reusing the records of a recent parse of the same file.
+
+        The file is stream-parsed from a read-only memory map. Results are cached
+        by path, modification time and size; callers always get their own copies
+        of the records, since the UI edits them in place.
+
+        Args:
+            file_path: Path of the MXLIFF file
+            logger: Optional logging callable
+            progress_callback: Optional callable receiving (bytes_read, total_bytes)
+
+        Returns:
+            list: One record per trans-unit (see _build_record)
+        """
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        with _parse_cache_lock:
+            cached_data = _PARSE_CACHE.get(cache_key)
+            if cached_data is not None:
+                _PARSE_CACHE.move_to_end(cache_key)
+
+        if cached_data is not None:
+            if logger:
+                logger("File unchanged since it was last parsed, reusing the parsed records")
+            if progress_callback:
+                progress_callback(stat.st_size, stat.st_size)
+            return [dict(item) for item in cached_data]
+
+        with open(file_path, 'rb') as f:
+            if stat.st_size == 0:
+                # An empty file cannot be memory-mapped
+                processed_data = XMLParser.parse_xml_bytes(b'', logger, progress_callback)
+            else:
+                # The kernel pages the file in as the parser advances, so it is never
+                # copied into memory as a whole
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    processed_data = XMLParser.parse_xml_from_buffer(mm, logger, progress_callback)
+
+        with _parse_cache_lock:
+            _PARSE_CACHE[cache_key] = [dict(item) for item in processed_data]
+            while len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+
+        return processed_data
+
+    @staticmethod
+    def parse_xml_from_buffer(buffer, logger=None, progress_callback=None):
+        """
+        Parse an MXLIFF document that is already available as a bytes-like buffer.
+
+        An mmap is read in place, so the kernel pages the file in as the parser
+        advances and no second copy of the file is made.
+
+        Args:
+            buffer: mmap, bytes or bytearray holding the raw MXLIFF file
+            logger: Optional logging callable
+            progress_callback: Optional callable receiving (bytes_read, total_bytes)
+
+        Returns:
+            list: One record per trans-unit (see _build_record)
+        """
+        if not isinstance(buffer, mmap.mmap):
+            return XMLParser.parse_xml_bytes(buffer, logger, progress_callback)
+        return XMLParser.parse_xml_stream(buffer, logger, progress_callback)
+
+    @staticmethod
+    def parse_xml_bytes(content, logger=None, progress_callback=None):
+        """
+        Parse raw MXLIFF bytes without decoding the whole document to str first.
+
+        Groups are located on the bytes and only each group's markup is decoded.
+
+        Args:
+            content: bytes or bytearray holding the raw MXLIFF file
+            logger: Optional logging callable
+            progress_callback: Optional callable receiving (bytes_read, total_bytes)
+
+        Returns:
+            list: One record per trans-unit (see _build_record)
+        """
+        return XMLParser.parse_xml_stream(content, logger, progress_callback)
+
+    @staticmethod
+    def _process_group(group, group_idx, processed_data, logger=None):
+        """Append the records for the markup of one <group> element to processed_data."""
+        # Extract group ID
+        group_id_match = re.search(r'<group\s+id="([^"]*)"', group)
+        group_id = group_id_match.group(1) if group_id_match else f"group_{group_idx}"
+
+        context_group_pattern = r'<context-group[^>]*>(.*?)</context-group>'
+        key_pattern = r'<context\s+context-type="x-key"[^>]*>(.*?)</context>'
+        note_pattern = r'<context\s+context-type="x-key-note"[^>]*>(.*?)</context>'
+
+        # Extract context-group for this group (if any)
+        context_group_match = re.search(context_group_pattern, group, re.DOTALL)
+
+        # Default context information for this group
+        group_key = ""
+        group_note_text = ""
+
+        if context_group_match:
+            context_group_content = context_group_match.group(1)
+
+            # Extract key
+            key_match = re.search(key_pattern, context_group_content, re.DOTALL)
+            if key_match:
+                group_key = key_match.group(1).strip()
+
+            # Extract notes
+            note_match = re.search(note_pattern, context_group_content, re.DOTALL)
+            if note_match:
+                group_note_text = note_match.group(1).strip()
+
+        # Find all trans-units within this group
+        trans_unit_pattern = r'<trans-unit[^>]*>.*?</trans-unit>'
+        trans_units = re.findall(trans_unit_pattern, group, re.DOTALL)
+
+        if logger:
+            logger(f"Group {group_id} contains {len(trans_units)} trans-units")
+
+        # Process trans-units in this group
+        for trans_idx, trans_unit in enumerate(trans_units):
+            # Extract source and target
+            source_pattern = r'<source[^>]*>(.*?)</source>'
+            target_pattern = r'<target[^>]*>(.*?)</target>'
+
+            source_match = re.search(source_pattern, trans_unit, re.DOTALL)
+            target_match = re.search(target_pattern, trans_unit, re.DOTALL)
+
+            source_text = source_match.group(1).strip() if source_match else ""
+            target_text = target_match.group(1).strip() if target_match else ""
+
+            # Extract trans-unit ID for better tracking
+            trans_id_match = re.search(r'<trans-unit\s+id="([^"]*)"', trans_unit)
+            trans_id = trans_id_match.group(1) if trans_id_match else f"trans_{trans_idx}"
+
+            # Check if this trans-unit has its own context information
+            unit_context_group_match = re.search(context_group_pattern, trans_unit, re.DOTALL)
+
+            # Variables to store context information for this specific trans-unit
+            unit_key = group_key
+            unit_note_text = group_note_text
+
+            if unit_context_group_match:
+                # This trans-unit has its own context group, override the group-level context
+                unit_context_content = unit_context_group_match.group(1)
+
+                # Extract key
+                unit_key_match = re.search(key_pattern, unit_context_content, re.DOTALL)
+                if unit_key_match:
+                    unit_key = unit_key_match.group(1).strip()
+
+                # Extract notes
+                unit_note_match = re.search(note_pattern, unit_context_content, re.DOTALL)
+                if unit_note_match:
+                    unit_note_text = unit_note_match.group(1).strip()
+
+            processed_data.append(XMLParser._build_record(
+                len(processed_data), group_id, trans_id, source_text, target_text, unit_key, unit_note_text
+            ))
+
+    @staticmethod
+    def _build_record(index, group_id, trans_id, source_text, target_text, unit_key, unit_note_text):
+        """Build a processed record, extracting speaker/player metadata from the note text."""
+        # Extract metadata from note text
+        speaker = ""
+        speaker_target = ""
+        speaker_gender = ""
+        player_class = ""
+        player_gender = ""
+        order_value = 9999
+
+        if unit_note_text:
+            # Extract speaker information
+            speaker_match = re.search(r'Speaker:\s*([^\n]+)', unit_note_text)
+            speaker_target_match = re.search(r'Target:\s*([^\n]+)', unit_note_text)
+            speaker_gender_match = re.search(r'Speaker Gender:\s*([^\n]+)', unit_note_text)
+            player_class_match = re.search(r'Class:\s*([^\n]+)', unit_note_text)
+            player_gender_match = re.search(r'Player Gender:\s*([^\n]+)', unit_note_text)
+
+            if speaker_match:
+                speaker = speaker_match.group(1).strip()
+            if speaker_target_match:
+                speaker_target = speaker_target_match.group(1).strip()
+            if speaker_gender_match:
+                speaker_gender = speaker_gender_match.group(1).strip()
+            if player_class_match:
+                player_class = player_class_match.group(1).strip()
+            if player_gender_match:
+                player_gender = player_gender_match.group(1).strip()
+
+            # Additional specific patterns to ensure we capture the gender info
+            if not speaker_gender:
+                gender_match = re.search(r'Gender:\s*([^,\n]+)', unit_note_text)
+                if gender_match:
+                    speaker_gender = gender_match.group(1).strip()
+
+            # Look for "speaking to:" pattern which might indicate player gender
+            speaking_to_match = re.search(r'speaking to:\s*([^,\n]+)', unit_note_text)
+            if speaking_to_match and not speaker_target:
+                speaker_target = speaking_to_match.group(1).strip()
+
+            # Extract order value
+            order_value = extract_order_value(unit_note_text)
+
+        # Create a record
+        return {
+            'index': index,
+            'group_id': group_id,
+            'trans_id': trans_id,
+            'source_text': source_text,
+            'target_text': target_text,
+            'original_target_text': target_text,  # Store original for change detection
+            'key': unit_key,
+            'speaker': speaker,
+            'speaker_target': speaker_target,
+            'speaker_gender': speaker_gender,
+            'player_class': player_class,
+            'player_gender': player_gender,
+            'order_value': order_value,
+            'note_text': unit_note_text,
+            'is_menulabel': 'MenuLabel' in unit_key  # Flag for MenuLabel entries
+        }
+
+    @staticmethod
+    def update_xml_file(src_path, dst_path, processed_data, logger=None):
+        """
+        Re-read the original MXLIFF from disk and write the updated XML to dst_path.
+
+        The original content is only materialized for the duration of the export
+        instead of being kept in memory for the whole editing session.
+        """
+        original_xml_content = _read_utf8_file(src_path)
+
+        updated_xml = XMLParser.update_xml_content(original_xml_content, processed_data, logger)
+
+        # Encode in chunks so the whole document is never duplicated as one bytes object
+        encoder = codecs.getincrementalencoder('utf-8')()
+        with open(dst_path, 'wb') as f:
+            for start in range(0, len(updated_xml), WRITE_CHUNK_SIZE):
+                f.write(encoder.encode(updated_xml[start:start + WRITE_CHUNK_SIZE]))
+            f.write(encoder.encode('', final=True))
+
     @staticmethod
     def update_xml_content(original_xml_content, processed_data, logger=None):
         """Update the original XML content with the edited translations."""
@@ -215,18 +438,18 @@ class XMLParser:
 
         # First approach: Find all trans-units and update directly
         trans_unit_pattern = r'(<trans-unit[^>]*>.*?</trans-unit>)'
-        trans_units = re.findall(trans_unit_pattern, updated_xml, re.DOTALL)
-
-        if logger:
-            logger(f"Found {len(trans_units)} total trans-units in XML")
+        context_group_pattern = r'<context-group[^>]*>(.*?)</context-group>'
 
         # Dictionary to track which keys we've successfully updated
         updated_keys = set()
+        trans_unit_count = 0
+
+        def apply_edit(match):
+            nonlocal trans_unit_count
+            trans_unit_count += 1
+            trans_unit = match.group(1)
 
-        # Process each trans-unit
-        for trans_unit in trans_units:
             # Try to extract key from context-group
-            context_group_pattern = r'<context-group[^>]*>(.*?)</context-group>'
             context_group_match = re.search(context_group_pattern, trans_unit, re.DOTALL)
 
             key = None
@@ -244,28 +467,24 @@ class XMLParser:
                 target_match = re.search(target_pattern, trans_unit, re.DOTALL)
 
                 if target_match:
+                    # Track that we've updated this key
+                    updated_keys.add(key)
+
                     # Create updated trans-unit with new translation
                     new_text = edited_translations[key]['new']
-                    updated_trans_unit = trans_unit.replace(
+                    return trans_unit.replace(
                         target_match.group(0),
                         f"{target_match.group(1)}{new_text}{target_match.group(3)}"
                     )
 
-                    # Use a very specific replacement to avoid accidental matches
-                    # We wrap the trans-unit with unique markers and then replace the whole block
-                    marker_start = f"<!-- XMLUPDATE_START_{id(trans_unit)} -->"
-                    marker_end = f"<!-- XMLUPDATE_END_{id(trans_unit)} -->"
+            return trans_unit
 
-                    marked_original = f"{marker_start}{trans_unit}{marker_end}"
-                    marked_updated = f"{marker_start}{updated_trans_unit}{marker_end}"
+        # Rebuild the document in a single pass; replacing each edited trans-unit in the
+        # whole string would copy the entire document once per edit
+        updated_xml = re.sub(trans_unit_pattern, apply_edit, updated_xml, flags=re.DOTALL)
 
-                    # First add the markers
-                    updated_xml = updated_xml.replace(trans_unit, marked_original)
-                    # Then replace the marked block
-                    updated_xml = updated_xml.replace(marked_original, marked_updated)
-
-                    # Track that we've updated this key
-                    updated_keys.add(key)
+        if logger:
+            logger(f"Found {trans_unit_count} total trans-units in XML")
 
         # Check if all edits were applied
         missing_keys = set(edited_translations.keys()) - updated_keys